@@ -3,8 +3,12 @@ MA Truck Charging Site Selection Dashboard
 Full GeoPandas version with authentication
 """
 import os
+import time
 import logging
+import orjson
+import plotly.io as pio
 from flask import Flask, render_template, redirect, url_for, request
+from flask.json.provider import JSONProvider
 from flask_login import login_required, current_user
 from dash import Dash
 import dash_bootstrap_components as dbc
@@ -36,13 +40,33 @@ logger = logging.getLogger(__name__)
 # DATABASE INITIALIZATION
 # ==========================
 logger.info("Initializing database...")
-Base.metadata.create_all(bind=engine)
+with engine.begin() as conn:
+    Base.metadata.create_all(bind=conn, checkfirst=True)
+# Drop pooled connections so gunicorn workers forked from a --preload master
+# open their own instead of sharing the parent's sockets/file handles.
+engine.dispose()
 logger.info("Database tables created/verified")
 
 # ==========================
 # FLASK SERVER SETUP
 # ==========================
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson"""
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self._OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 server = Flask(__name__)
+server.json = ORJSONProvider(server)
+
+# Dash serializes callback responses through plotly's JSON encoder; pin it to
+# orjson rather than relying on auto-detection.
+pio.json.config.default_engine = "orjson"
 server.secret_key = os.environ.get("SECRET_KEY", "CHANGE_ME_IN_PRODUCTION")
 
 # Initialize Flask-Login
@@ -52,6 +76,10 @@ login_manager.login_view = 'auth.login'  # Redirect to login page when not authe
 # Register Flask auth blueprint
 server.register_blueprint(auth)
 
+# Response compression (enabled through Dash's compress=True below)
+server.config['COMPRESS_LEVEL'] = 6
+server.config['COMPRESS_MIN_SIZE'] = 1024
+
 logger.info("Flask server initialized with authentication")
 
 # ==========================
@@ -85,6 +113,7 @@ app = Dash(
         "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css"
     ],
     suppress_callback_exceptions=True,
+    compress=True,
     title="MA Truck Charging Site Selector",
     meta_tags=[
         {"name": "viewport", "content": "width=device-width, initial-scale=1"}
@@ -103,33 +132,54 @@ logger.info("Dash application initialized")
 # PROTECT DASH APP WITH LOGIN
 # ==========================
 
+# Paths that never require authentication; kept as a tuple so a single
+# str.startswith() call covers them all.
+_PUBLIC_PATHS = (
+    '/login',
+    '/register',
+    '/logout',
+    '/health',
+    '/favicon.ico',
+    '/static/',                       # Allow static files
+    '/dash/_dash-component-suites/',  # Dash's public JS/CSS bundles
+)
+
+
 @server.before_request
 def check_login():
     """
     Protect all /dash/ routes with authentication.
     This runs before every request to check if user is authenticated.
     """
-    # List of paths that don't require authentication
-    public_paths = [
-        '/login',
-        '/register',
-        '/logout',
-        '/health',
-        '/static/',  # Allow static files
-        '/_dash',    # Allow Dash internal requests after auth check
-    ]
-   
-    # Check if the current path requires authentication
-    if request.path.startswith('/dash/'):
-        if not current_user.is_authenticated:
-            logger.warning(f"Unauthenticated access attempt to {request.path}")
-            return redirect(url_for('auth.login', next=request.path))
-   
+    path = request.path
+
+    # Public paths return before current_user is touched, so they never read
+    # the session cookie or hit the user loader.
+    if path.startswith(_PUBLIC_PATHS):
+        return None
+
+    if path.startswith('/dash/') and not current_user.is_authenticated:
+        logger.warning("Unauthenticated access attempt to %s", path)
+        return redirect(url_for('auth.login', next=path))
+
     # Allow all other requests to continue
     return None
 
 logger.info("Authentication protection applied to /dash/ routes")
 
+# Layout/dependency JSON only changes on deploy; let browsers reuse it briefly.
+# Fingerprinted component-suite bundles already get a one-year max-age from Dash.
+_SHORT_CACHE_PATHS = ('/dash/_dash-layout', '/dash/_dash-dependencies')
+
+
+@server.after_request
+def add_cache_headers(response):
+    """Add short-lived Cache-Control headers to Dash's layout JSON"""
+    if request.path in _SHORT_CACHE_PATHS and response.status_code == 200:
+        response.headers['Cache-Control'] = 'private, max-age=60'
+    return response
+
+
 # ==========================
 # PRELOAD DATA ON STARTUP
 # ==========================
@@ -139,11 +189,25 @@ logger.info("=" * 70)
 
 try:
     # This triggers the data loading and score computation
-    # The get_selector() function caches the result
+    # The get_selector() function caches the result. With gunicorn --preload
+    # this runs once in the master and workers share it copy-on-write.
     selector = get_selector()
+
+    # Build the tract spatial index now (before gunicorn forks) so the first
+    # spatial query doesn't pay for it
+    selector.gdf.sindex
    
     logger.info("✓ Selector preloaded successfully")
-    logger.info(f"✓ Data loaded with {len(selector.gdf)} census tracts")
+    logger.info("✓ Data loaded with %d census tracts", len(selector.gdf))
+
+    # Build and serialize a couple of figures so plotly's lazily imported
+    # validators/encoders are loaded before the first user callback
+    warm_start = time.perf_counter()
+    from visualizations import create_initial_map, create_empty_figure
+    import plotly.express  # noqa: F401  (imported lazily by several callbacks)
+    create_initial_map().to_json()
+    create_empty_figure("Run analysis first").to_json()
+    logger.info("✓ Visualizations warmed in %.0f ms", (time.perf_counter() - warm_start) * 1000)
     logger.info("✓ Initial composite scores calculated")
     logger.info("=" * 70)
     logger.info("APPLICATION READY")
@@ -152,7 +216,7 @@ try:
 except Exception as e:
     logger.error("=" * 70)
     logger.error("FAILED TO PRELOAD SELECTOR")
-    logger.error(f"Error: {e}", exc_info=True)
+    logger.error("Error: %s", e, exc_info=True)
     logger.error("=" * 70)
     logger.error("Application may not function correctly")
     logger.error("Please check your data file path and selector.py implementation")
@@ -164,7 +228,7 @@ if __name__ == "__main__":
     port = int(os.environ.get("PORT", 10000))
     debug = os.environ.get("FLASK_ENV") == "development"
    
-    logger.info(f"Starting server on port {port} (debug={debug})")
+    logger.info("Starting server on port %s (debug=%s)", port, debug)
    
     server.run(
         host="0.0.0.0",
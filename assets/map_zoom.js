@@ -0,0 +1,43 @@
+/*
+ * Client-side tract-link zoom.
+ * Clicking a GEOID in the rankings table only moves the overview map's view,
+ * so the centre comes from a small GEOID -> [lat, lon] store and the map is
+ * updated in the browser without a server round-trip.
+ */
+(function () {
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        map: {
+            zoomToTract: function (nClicks, centroids, mapChildren) {
+                var noUpdate = window.dash_clientside.no_update;
+                // The ALL input also fires when new links appear; only act on a real click
+                var triggered = window.dash_clientside.callback_context.triggered;
+                if (!triggered || triggered.length !== 1 || !triggered[0].value) {
+                    return noUpdate;
+                }
+                var propId = triggered[0].prop_id;
+                var geoid = JSON.parse(propId.slice(0, propId.lastIndexOf('.'))).index;
+                var center = centroids && centroids[geoid];
+                var props = mapChildren && mapChildren.props;
+                if (!center || !props || !props.figure || !props.figure.layout) {
+                    return noUpdate;
+                }
+
+                var layout = props.figure.layout;
+                var newLayout = Object.assign({}, layout, {
+                    mapbox: Object.assign({}, layout.mapbox, {
+                        center: {lat: center[0], lon: center[1]},
+                        zoom: 11
+                    }),
+                    // A fresh uirevision makes Plotly apply the new centre even
+                    // after the user has panned the map
+                    uirevision: 'zoom-' + geoid + '-' + Date.now()
+                });
+                return Object.assign({}, mapChildren, {
+                    props: Object.assign({}, props, {
+                        figure: Object.assign({}, props.figure, {layout: newLayout})
+                    })
+                });
+            }
+        }
+    });
+})();
@@ -0,0 +1,89 @@
+/*
+ * Client-side weight badges and validators.
+ * These only format or add up slider/input values, so they run in the browser
+ * instead of making a server round-trip on every change.
+ */
+(function () {
+    function icon(className) {
+        return {namespace: 'dash_html_components', type: 'I', props: {className: className}};
+    }
+
+    // Icon nodes are built once and shared by every alert
+    var ICON_OK_2 = icon('fas fa-check-circle me-2');
+    var ICON_WARN_2 = icon('fas fa-exclamation-triangle me-2');
+    var ICON_OK_1 = icon('fas fa-check-circle me-1');
+    var ICON_WARN_1 = icon('fas fa-exclamation-triangle me-1');
+    var ICON_INFO_1 = icon('fas fa-info-circle me-1');
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        validation: {
+            _alert: function (iconNode, color, className, text) {
+                return {
+                    namespace: 'dash_bootstrap_components',
+                    type: 'Alert',
+                    props: {
+                        children: [iconNode, text],
+                        color: color,
+                        className: className
+                    }
+                };
+            },
+
+            _hasMissing: function (values) {
+                return values.some(function (v) { return v === null || v === undefined; });
+            },
+
+            // Percentage badges next to the main category sliders
+            weightBadges: function (demand, infra, access, equity) {
+                return [demand + '%', infra + '%', access + '%', equity + '%'];
+            },
+
+            // Main category weights should total 100%
+            weightTotal: function (demand, infra, access, equity) {
+                var total = demand + infra + access + equity;
+                var ok = Math.abs(total - 100) < 0.01;
+                var shown = Math.round(total);
+                return window.dash_clientside.validation._alert(
+                    ok ? ICON_OK_2 : ICON_WARN_2, ok ? 'success' : 'warning',
+                    'py-2 px-3 mb-0 small',
+                    ok ? 'Total: ' + shown + '% ✓' : 'Total: ' + shown + '% (should be 100%)'
+                );
+            },
+
+            // Sub-weight groups (infrastructure, accessibility, temporal) should sum to 100
+            subweightSum: function () {
+                var values = Array.prototype.slice.call(arguments);
+                var v = window.dash_clientside.validation;
+                if (v._hasMissing(values)) {
+                    throw window.dash_clientside.PreventUpdate;
+                }
+                var total = values.reduce(function (a, b) { return a + b; }, 0);
+                var ok = Math.abs(total - 100) < 0.5;
+                var shown = Math.round(total);
+                return v._alert(
+                    ok ? ICON_OK_1 : ICON_WARN_1, ok ? 'success' : 'warning',
+                    'py-1 px-2 mb-0 small',
+                    ok ? 'Sum: ' + shown + ' ✓' : 'Sum: ' + shown + ' (should be 100)'
+                );
+            },
+
+            // Equity & Feasibility: positive weights should sum to 90, penalty 10
+            equitySubweights: function (ej, landuse, commercial, protectedPenalty) {
+                var v = window.dash_clientside.validation;
+                if (v._hasMissing([ej, landuse, commercial, protectedPenalty])) {
+                    throw window.dash_clientside.PreventUpdate;
+                }
+                var positiveSum = ej + landuse + commercial;
+                var ok = Math.abs(positiveSum - 90) < 0.5 && Math.abs(protectedPenalty - 10) < 0.5;
+                var pos = Math.round(positiveSum);
+                var pen = Math.round(protectedPenalty);
+                return v._alert(
+                    ok ? ICON_OK_1 : ICON_INFO_1, ok ? 'success' : 'info',
+                    'py-1 px-2 mb-0 small',
+                    ok ? 'Positive weights: ' + pos + ' ✓, Penalty: ' + pen
+                       : 'Positive: ' + pos + ', Penalty: ' + pen + ' (target: 90 / 10)'
+                );
+            }
+        }
+    });
+})();
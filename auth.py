@@ -1,20 +1,20 @@
 """
 Authentication routes and logic
 """
-from flask import Blueprint, render_template, redirect, request, url_for, flash
+from flask import Blueprint, render_template, redirect, request, url_for, flash, g
 from flask_login import LoginManager, login_user, login_required, logout_user, UserMixin, current_user
+from sqlalchemy import text
 from db import get_db, engine
-from models import User, Base
+from models import User
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
 # Create blueprint
 auth = Blueprint("auth", __name__)
 
-# Initialize database tables
-Base.metadata.create_all(bind=engine)
-
 # Setup login manager
 login_manager = LoginManager()
 login_manager.login_view = "auth.login"
@@ -28,17 +28,66 @@ class UserModel(UserMixin):
         self.username = username
 
 
+# ==========================
+# USER LOADER CACHE
+# ==========================
+# Dash fires one request per callback, so the same user is loaded many times
+# per interaction. Keep recently loaded users for a short time.
+_USER_CACHE_TTL = 60  # seconds
+_USER_CACHE_MAXSIZE = 1024
+_user_cache = {}
+_user_cache_lock = threading.Lock()
+
+# Plain SQL for the user loader; avoids ORM session setup on a hot path
+_USER_QUERY = text(f"SELECT id, username FROM {User.__tablename__} WHERE id = :id")
+
+
+def _get_cached_user(user_id):
+    """Return a cached UserModel if it has not expired"""
+    with _user_cache_lock:
+        entry = _user_cache.get(user_id)
+        if entry is None:
+            return None
+        user, expires_at = entry
+        if expires_at < time.monotonic():
+            del _user_cache[user_id]
+            return None
+        return user
+
+
+def _cache_user(user_id, user):
+    """Store a UserModel in the TTL cache"""
+    with _user_cache_lock:
+        if len(_user_cache) >= _USER_CACHE_MAXSIZE:
+            _user_cache.clear()
+        _user_cache[user_id] = (user, time.monotonic() + _USER_CACHE_TTL)
+
+
+def _invalidate_user(user_id):
+    """Drop a user from the TTL cache"""
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
+
+
 @login_manager.user_loader
 def load_user(user_id):
     """Load user by ID for Flask-Login"""
-    try:
-        with get_db() as db:
-            user = db.query(User).filter(User.id == int(user_id)).first()
-            if user:
-                return UserModel(user.id, user.username)
-    except Exception as e:
-        logger.error(f"Error loading user: {e}")
-    return None
+    if 'user' in g:
+        return g.user
+
+    user_obj = _get_cached_user(user_id)
+    if user_obj is None:
+        try:
+            with engine.connect() as conn:
+                row = conn.execute(_USER_QUERY, {'id': int(user_id)}).first()
+            if row:
+                user_obj = UserModel(row.id, row.username)
+                _cache_user(user_id, user_obj)
+        except Exception as e:
+            logger.error("Error loading user: %s", e)
+
+    g.user = user_obj
+    return user_obj
 
 
 @auth.route("/login", methods=["GET", "POST"])
@@ -60,7 +109,7 @@ def login():
                     user_obj = UserModel(user.id, user.username)
                     login_user(user_obj)
                    
-                    logger.info(f"User logged in: {username}")
+                    logger.info("User logged in: %s", username)
                    
                     # Redirect to next page or dashboard
                     next_page = request.args.get('next')
@@ -72,7 +121,7 @@ def login():
                 else:
                     flash("Invalid username or password", "error")
         except Exception as e:
-            logger.error(f"Login error: {e}")
+            logger.error("Login error: %s", e)
             flash("An error occurred. Please try again.", "error")
 
     return render_template("login.html")
@@ -112,12 +161,12 @@ def register():
                 db.add(new_user)
                 db.commit()
 
-                logger.info(f"New user registered: {username}")
+                logger.info("New user registered: %s", username)
                 flash("Account created successfully! Please log in.", "success")
                 return redirect(url_for("auth.login"))
 
         except Exception as e:
-            logger.error(f"Registration error: {e}")
+            logger.error("Registration error: %s", e)
             flash("An error occurred. Please try again.", "error")
 
     return render_template("register.html")
@@ -128,7 +177,8 @@ def register():
 def logout():
     """Logout route"""
     username = getattr(current_user, 'username', 'Unknown')
+    _invalidate_user(str(current_user.get_id()))
     logout_user()
-    logger.info(f"User logged out: {username}")
+    logger.info("User logged out: %s", username)
     flash("You have been logged out.", "info")
     return redirect(url_for("auth.login"))
\ No newline at end of file
@@ -1,29 +1,317 @@
-import dash
-from dash import Input, Output, State, dcc, ALL, Patch
+from dash import Input, Output, State, dcc, ctx, no_update, ALL, MATCH, ClientsideFunction
 from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
 from dash import html
-import geopandas as gpd
-import pandas as pd
-import json
+import csv
+import io
 import logging
-from data_loader import get_selector
-from visualizations import (
-    create_optimal_sites_map,
-    create_empty_figure,
-    create_initial_map,
-    create_score_distribution_chart,
-    create_component_comparison_chart,
-    create_radar_chart,
-    get_score_color
-)
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from functools import lru_cache
+from layout import create_metric_card
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
 
+# Expand/collapse icons shared by the sub-weight toggle
+_CHEVRON_UP = html.I(className="fas fa-chevron-up")
+_CHEVRON_DOWN = html.I(className="fas fa-chevron-down")
+
+
+# ============================================================================
+# SITE RANKINGS TABLE CELLS
+# ============================================================================
+# NOTE: In this secondary-corridor tool, `charging_type` is currently the
+# long-distance-share classifier from the console log (long_distance vs other).
+# Keep the mapping explicit so the table doesn't default to "Unclassified".
+_TYPE_ICONS = {
+    'long_distance': ('🛣️', 'Long-distance', 'warning'),
+    'other': ('🏙️', 'Other', 'secondary'),
+    'unclassified': ('❓', 'Unclassified', 'secondary')
+}
+
+
+# Result columns the rankings table reads
+_RANKINGS_COLS = ('GEOID', 'charging_type', 'composite_score', 'demand_score',
+                  'infrastructure_score', 'accessibility_score', 'equity_feasibility_score')
+
+
+def _format_column(df, col, fmt='{:.1f}', default=0):
+    """Format one column for a table in a single pass (default when the column is missing)"""
+    if col in df.columns:
+        return df[col].map(fmt.format).tolist()
+    return [fmt.format(default)] * len(df)
+
+
+@lru_cache(maxsize=8)
+def _charging_type_cell(ctype):
+    """Charging-type cell for the rankings table; one shared instance per type"""
+    icon, type_label, badge_color = _TYPE_ICONS.get(ctype, _TYPE_ICONS['unclassified'])
+    return html.Td([
+        html.Span(icon, className="me-1"),
+        dbc.Badge(type_label, color=badge_color, className="me-2"),
+    ], className="text-nowrap")
+
+
+# ============================================================================
+# SELECTOR WEIGHT LAYOUT
+# ============================================================================
+# Key order for each selector.config weight group, matching the order the
+# sliders are passed to run_analysis. Built once; run_analysis zips slider
+# values onto these instead of spelling out every dict literal per click.
+
+# Category slider id prefixes ('{cat}-weight'), shared by the callback specs
+_WEIGHT_CATS = ('demand', 'infrastructure', 'accessibility', 'equity')
+
+_MAIN_WEIGHT_KEYS = ('demand', 'infrastructure', 'accessibility', 'equity_feasibility')
+
+_DEMAND_WEIGHT_KEYS = (
+    'home_end_weight', 'workplace_end_weight', 'other_end_weight',        # Trip purpose
+    'weekday_weight', 'weekend_weight',                                   # Day of week
+    'equity_community_weight', 'non_equity_community_weight',             # Equity vs non-equity trips
+    'temporal_stability_weight', 'temporal_peak_weight',                  # Temporal pattern
+)
+
+_INFRA_WEIGHT_KEYS = ('truck_charger_gap_weight', 'park_ride_weight', 'government_weight')
+
+_ACCESS_WEIGHT_KEYS = ('network_weight', 'grocery_weight', 'gas_station_weight')
+
+_EQUITY_WEIGHT_KEYS = (
+    'ej_priority_weight', 'landuse_suit_weight',
+    'commercial_industrial_weight', 'protected_penalty_weight',
+)
+
+# Demand component weights (fixed design share; normalized in selector)
+_DEMAND_COMPONENT_WEIGHTS = {
+    'purpose': 0.35,
+    'day_of_week': 0.25,
+    'equity_trips': 0.20,
+    'temporal_pattern': 0.20
+}
+
+# Default sub-weight slider values per category, as (slider id prefix, value)
+# in the same order as the sliders in layout.py. Demand groups each sum to
+# 100; equity positives sum to 90 with a 10-point protected-land penalty.
+_SUBWEIGHT_DEFAULTS = {
+    'demand': (
+        ('home-end', 40), ('workplace-end', 40), ('other-end', 20),          # Trip purpose
+        ('weekday', 70), ('weekend', 30),                                    # Day of week
+        ('equity-community', 50), ('non-equity-community', 50),              # Equity vs non-equity
+        ('temporal-stability', 60), ('temporal-peak', 40),                   # Temporal pattern
+    ),
+    'infrastructure': (('ev-gap', 45), ('park-ride', 30), ('government', 25)),
+    'accessibility': (('network-density', 50), ('grocery', 25), ('gas-station', 25)),
+    'equity': (
+        ('ej-priority', 40), ('landuse-suit', 35),
+        ('commercial', 15), ('protected-penalty', 10),
+    ),
+}
+
+# run_analysis State, keyed by its parameter names. Dash passes these as
+# keyword arguments, so settings can be added or removed without keeping a
+# positional order in sync between the decorator and the signature.
+_RUN_ANALYSIS_STATE = {
+    # Main category weights
+    'demand_w': State('demand-weight', 'value'),
+    'infra_w': State('infrastructure-weight', 'value'),
+    'access_w': State('accessibility-weight', 'value'),
+    'equity_w': State('equity-weight', 'value'),
+    # Demand sub-weights
+    'home_end_w': State('home-end-subweight', 'value'),
+    'workplace_end_w': State('workplace-end-subweight', 'value'),
+    'other_end_w': State('other-end-subweight', 'value'),
+    'weekday_w': State('weekday-subweight', 'value'),
+    'weekend_w': State('weekend-subweight', 'value'),
+    'equity_community_w': State('equity-community-subweight', 'value'),
+    'non_equity_community_w': State('non-equity-community-subweight', 'value'),
+    'temporal_stability_w': State('temporal-stability-subweight', 'value'),
+    'temporal_peak_w': State('temporal-peak-subweight', 'value'),
+    # Infrastructure sub-weights
+    'ev_gap_w': State('ev-gap-subweight', 'value'),
+    'park_ride_w': State('park-ride-subweight', 'value'),
+    'government_w': State('government-subweight', 'value'),
+    # Accessibility sub-weights
+    'network_density_w': State('network-density-subweight', 'value'),
+    'grocery_w': State('grocery-subweight', 'value'),
+    'gas_station_w': State('gas-station-subweight', 'value'),
+    # Equity sub-weights
+    'ej_priority_w': State('ej-priority-subweight', 'value'),
+    'landuse_suit_w': State('landuse-suit-subweight', 'value'),
+    'commercial_w': State('commercial-subweight', 'value'),
+    'protected_penalty_w': State('protected-penalty-subweight', 'value'),
+    # Other parameters
+    'n_sites': State('n-sites-input', 'value'),
+    'min_dist': State('min-distance-slider', 'value'),
+    'min_person_trips': State('min-person-input', 'value'),
+    'secondary_buffer_value': State('secondary-buffer-toggle', 'value'),
+    'rural_only_value': State('rural-only-toggle', 'value'),
+    'exclude_zero_headroom_value': State('exclude-zero-headroom-toggle', 'value'),
+}
+
+
+def _norm(vals, keys):
+    """Weight dict for a sub-weight group, scaled to sum to 1 (all zeros disables the group)
+
+    A cleared input arrives as None and counts as 0.
+    """
+    vals = [v or 0 for v in vals]
+    total = sum(vals)
+    if total > 0:
+        return dict(zip(keys, (v / total for v in vals)))
+    return dict.fromkeys(keys, 0.0)
+
+
+# ============================================================================
+# ANALYSIS RESULT STORES
+# ============================================================================
+# scored-data-store / selected-sites-store hold a token; the GeoDataFrames
+# themselves stay server-side (see data_loader.store_analysis_result), always
+# with a CRS set, so callbacks don't need to default it.
+
+def _store_to_gdf(token):
+    """Return a copy of the analysis result GeoDataFrame behind a store token"""
+    from data_loader import load_analysis_result
+
+    gdf = load_analysis_result(token)
+    if gdf is None:
+        import geopandas as gpd
+        logger.warning("Analysis result for store token not found (expired?)")
+        return gpd.GeoDataFrame()
+    return gdf.copy()
+
+
+def _store_columns(token, columns):
+    """Return a plain DataFrame of just `columns` (those present) from the result
+    behind a store token; attribute-only consumers never copy the geometry"""
+    from data_loader import load_analysis_result
+
+    gdf = load_analysis_result(token)
+    if gdf is None:
+        import pandas as pd
+        logger.warning("Analysis result for store token not found (expired?)")
+        return pd.DataFrame()
+    # Column selection without the geometry column is a new plain DataFrame
+    return gdf[[c for c in columns if c in gdf.columns]]
+
+
+def _store_rows(token, column, value, columns):
+    """Return a new GeoDataFrame of the stored result's rows where `column == value`,
+    with only `columns` (those present) plus geometry; rows and columns are
+    gathered in one step, so nothing else is copied"""
+    from data_loader import load_analysis_result
+
+    gdf = load_analysis_result(token)
+    if gdf is None:
+        import geopandas as gpd
+        logger.warning("Analysis result for store token not found (expired?)")
+        return gpd.GeoDataFrame()
+    mask = (gdf[column] == value).to_numpy()
+    return gdf.loc[mask, [c for c in columns if c in gdf.columns] + [gdf.geometry.name]]
+
+
+# Attribute columns read by the chart callbacks that never draw geometry
+_COMPONENT_SCORE_COLS = ('demand_score', 'infrastructure_score',
+                         'accessibility_score', 'equity_feasibility_score')
+_ANALYTICS_COLS = ('GEOID', 'feasible', 'composite_score') + _COMPONENT_SCORE_COLS
+_TEMPORAL_SCATTER_COLS = ('GEOID', 'feasible', 'demand_score',
+                          'heavy_duty_demand_uniformity', 'demand_uniformity',
+                          'heavy_duty_peak_to_avg_ratio', 'temporal_peak_intensity')
+_CHARGING_TYPE_COLS = ('feasible', 'charging_type')
+# Feasible tracts drawn individually in the temporal scatter before it thins them
+_TEMPORAL_SCATTER_MAX_POINTS = 3000
+_URBAN_RURAL_COLS = ('feasible', 'urban_rural_context')
+# Attribute columns drawn or shown on hover by the charging-type / urban-rural maps
+_CHARGING_TYPE_MAP_COLS = ('GEOID', 'charging_type', 'composite_score',
+                           'depot_score', 'opportunistic_score', 'corridor_score')
+_URBAN_RURAL_MAP_COLS = ('GEOID', 'urban_rural_context', 'composite_score',
+                         'urban_context_bonus', 'rural_context_bonus', 'landuse_diversity_score')
+
+
+
+# ============================================================================
+# RECENT ANALYSIS RUNS
+# ============================================================================
+# run_analysis remembers the outputs of its last few distinct settings, so a
+# repeat click, or switching back to earlier settings, returns the previous
+# result instead of rescoring. Each entry holds two tokens, well within what
+# data_loader keeps on disk.
+_RECENT_RUNS = OrderedDict()
+_RECENT_RUNS_SIZE = 8
+_RECENT_RUNS_LOCK = threading.Lock()
+
+# The selector is one shared, mutable object (config in, scores out), so
+# concurrent analyses on threaded workers take turns on it.
+_ANALYSIS_LOCK = threading.Lock()
+
+# ============================================================================
+# OPTIMAL SITES EXPORT
+# ============================================================================
+# Output schema requested (ordered)
+_EXPORT_COLS = ('rank', 'GEOID', 'charging_type', 'composite_score', 'demand_score', 'infrastructure_score', 'accessibility_score', 'equity_feasibility_score', 'home_end_score', 'workplace_end_score', 'other_end_score', 'weekday_trip_score', 'weekend_trip_score', 'equity_community_trip_score', 'non_equity_community_trip_score', 'demand_stability_score', 'peak_intensity_score', 'charger_gap_score', 'park_ride_colocation_score', 'government_colocation_score', 'network_density_score', 'grocery_colocation_score', 'gas_station_colocation_score', 'ej_access_score', 'landuse_suitability_score', 'commercial_industrial_score', 'protected_land_penalty_score', 'pct_long_distance_trips', 'rural_flag', 'total_pop', 'median_feeder_headroom_mva')
+
+# CSV header names that differ from the internal column names
+_EXPORT_HEADER = tuple({'pct_long_distance_trips': '%_long_distance_trips'}.get(c, c)
+                       for c in _EXPORT_COLS)
+
+# Raw/source fields back-filled from selector.gdf
+_DESIRED_RAW_COLS = (
+    'GEOID',
+    'total_pop',
+    # 'Heavy_Duty', 'Light_Duty', 'Medium_Duty',
+    # 'avg_stop_duration_minutes',
+    # 'Heavy_Duty__AM_Peak_6_10',
+    # 'Heavy_Duty__Evening_19_6',
+    # 'Heavy_Duty__Midday_10_15',
+    # 'Heavy_Duty__PM_Peak_15_19',
+    'equity_0_trips', 'equity_1_trips', 'dow_1_trips', 'dow_2_3_trips', 'pct_long_distance_trips','rural_flag',
+    # 'government_social_services_within_5mi','grocery_stores_within_5mi','park_ride_spaces_within_5mi',
+    'poi_density_per_sq_mi',
+    'pct_ej_block_groups',
+    'rest_stop_density',
+    # 'substations_per_sq_mi',
+    # 'total_vehicles_domiciled',
+    'charging_type','median_feeder_headroom_mva'
+)
+
+# Stored-result columns the export can use (plus the legacy gap-score name)
+_EXPORT_KEEP_COLS = frozenset(_EXPORT_COLS) | {'truck_charger_gap_score'}
+# Raw columns worth pulling: the join key plus those that reach the export
+_RAW_EXPORT_COLS = tuple(c for c in _DESIRED_RAW_COLS
+                         if c == 'GEOID' or c in _EXPORT_KEEP_COLS)
+
 def register_callbacks(app):
     """Register all Dash callbacks"""
+    # Heavy data/plotting modules are imported here rather than at module
+    # level so importing callbacks.py stays cheap; the callbacks below close
+    # over these names.
+    import geopandas as gpd
+    import numpy as np
+    import pandas as pd
+    import plotly.express as px
+    import plotly.graph_objects as go
+    from data_loader import (
+        get_selector, store_analysis_result, load_analysis_result, get_result_centroid,
+        get_scored_data, get_truck_chargers
+    )
+    from visualizations import (
+        create_optimal_sites_map,
+        create_empty_figure,
+        create_initial_map,
+        create_score_distribution_chart,
+        create_component_comparison_chart,
+        create_radar_chart,
+        get_score_colors,
+        to_display_geojson
+    )
+
+    # Placeholder figures never change, so each is built once and returned as
+    # the same plain dict (Dash serializes it exactly like the Figure)
+    initial_map = create_initial_map().to_dict()
+    empty_run_analysis = create_empty_figure("Run analysis first").to_dict()
+    empty_no_sites = create_empty_figure("No sites selected").to_dict()
 
     # ========================================================================
     # NAVIGATION CALLBACKS
@@ -32,12 +320,11 @@ def register_callbacks(app):
     @app.callback(
         Output('outer-tabs', 'active_tab'),
         [Input('go-to-analysis-btn', 'n_clicks')],
-        [State('outer-tabs', 'active_tab')]
+        [State('outer-tabs', 'active_tab')],
+        prevent_initial_call=True
     )
     def go_to_analysis(n_clicks, current_tab):
         """Navigate to analysis dashboard"""
-        if n_clicks is None:
-            raise PreventUpdate
         return "tab-analysis"
     
     
@@ -58,298 +345,104 @@ def register_callbacks(app):
     # ========================================================================
 
     @app.callback(
-        [Output('demand-subweights-collapse', 'is_open'),
-         Output('demand-expand-btn', 'children')],
-        [Input('demand-expand-btn', 'n_clicks')],
-        [State('demand-subweights-collapse', 'is_open')]
-    )
-    def toggle_demand_subweights(n_clicks, is_open):
-        """Toggle demand sub-weights section"""
-        if n_clicks is None:
-            raise PreventUpdate
-        
-        new_state = not is_open
-        icon = html.I(className="fas fa-chevron-up" if new_state else "fas fa-chevron-down")
-        return new_state, icon
-
-    @app.callback(
-        [Output('infrastructure-subweights-collapse', 'is_open'),
-         Output('infrastructure-expand-btn', 'children')],
-        [Input('infrastructure-expand-btn', 'n_clicks')],
-        [State('infrastructure-subweights-collapse', 'is_open')]
-    )
-    def toggle_infrastructure_subweights(n_clicks, is_open):
-        """Toggle infrastructure sub-weights section"""
-        if n_clicks is None:
-            raise PreventUpdate
-        
-        new_state = not is_open
-        icon = html.I(className="fas fa-chevron-up" if new_state else "fas fa-chevron-down")
-        return new_state, icon
-
-    @app.callback(
-        [Output('accessibility-subweights-collapse', 'is_open'),
-         Output('accessibility-expand-btn', 'children')],
-        [Input('accessibility-expand-btn', 'n_clicks')],
-        [State('accessibility-subweights-collapse', 'is_open')]
-    )
-    def toggle_accessibility_subweights(n_clicks, is_open):
-        """Toggle accessibility sub-weights section"""
-        if n_clicks is None:
-            raise PreventUpdate
-        
-        new_state = not is_open
-        icon = html.I(className="fas fa-chevron-up" if new_state else "fas fa-chevron-down")
-        return new_state, icon
-
-    @app.callback(
-        [Output('equity-subweights-collapse', 'is_open'),
-         Output('equity-expand-btn', 'children')],
-        [Input('equity-expand-btn', 'n_clicks')],
-        [State('equity-subweights-collapse', 'is_open')]
+        [Output({'type': 'subweight-collapse', 'cat': MATCH}, 'is_open'),
+         Output({'type': 'subweight-expand-btn', 'cat': MATCH}, 'children')],
+        [Input({'type': 'subweight-expand-btn', 'cat': MATCH}, 'n_clicks')],
+        [State({'type': 'subweight-collapse', 'cat': MATCH}, 'is_open')],
+        prevent_initial_call=True
     )
-    def toggle_equity_subweights(n_clicks, is_open):
-        """Toggle equity sub-weights section"""
-        if n_clicks is None:
-            raise PreventUpdate
-        
+    def toggle_subweights(n_clicks, is_open):
+        """Toggle a category's sub-weights section"""
         new_state = not is_open
-        icon = html.I(className="fas fa-chevron-up" if new_state else "fas fa-chevron-down")
-        return new_state, icon
+        return new_state, _CHEVRON_UP if new_state else _CHEVRON_DOWN
 
     # ========================================================================
     # WEIGHT SLIDER CALLBACKS
     # ========================================================================
 
-    @app.callback(
-        [Output(f'{category}-badge', 'children') for category in
-         ['demand', 'infrastructure', 'accessibility', 'equity']],
-        [Input(f'{category}-weight', 'value') for category in
-         ['demand', 'infrastructure', 'accessibility', 'equity']]
+    # Badge text and sum-to-100 checks are pure formatting/arithmetic, so they
+    # run in the browser (see assets/validation.js) instead of round-tripping
+    # to the server.
+    app.clientside_callback(
+        ClientsideFunction(namespace='validation', function_name='weightBadges'),
+        [Output(f'{category}-badge', 'children') for category in _WEIGHT_CATS],
+        [Input(f'{category}-weight', 'value') for category in _WEIGHT_CATS],
+        prevent_initial_call=True
     )
-    def update_weight_badges(*weights):
-        """Update weight percentage badges"""
-        return [f"{w}%" for w in weights]
 
-    @app.callback(
+    app.clientside_callback(
+        ClientsideFunction(namespace='validation', function_name='weightTotal'),
         Output('weight-validation', 'children'),
-        [Input(f'{category}-weight', 'value') for category in
-         ['demand', 'infrastructure', 'accessibility', 'equity']]
+        [Input(f'{category}-weight', 'value') for category in _WEIGHT_CATS]
     )
-    def validate_weights(demand, infra, access, equity):
-        """Validate that weights sum to 100%"""
-        total = sum([demand, infra, access, equity])
-
-        # Use tolerance to avoid float/rounding artifacts (e.g., 99.999999 -> displays as 100)
-        if abs(total - 100) < 0.01:
-            return dbc.Alert([
-                html.I(className="fas fa-check-circle me-2"),
-                f"Total: {total:.0f}% ✓"
-            ], color="success", className="py-2 px-3 mb-0 small")
-        else:
-            return dbc.Alert([
-                html.I(className="fas fa-exclamation-triangle me-2"),
-                f"Total: {total:.0f}% (should be 100%)"
-            ], color="warning", className="py-2 px-3 mb-0 small")
 
     # ========================================================================
     # SUB-WEIGHT VALIDATION CALLBACKS
     # ========================================================================
 
-    @app.callback(
+    app.clientside_callback(
+        ClientsideFunction(namespace='validation', function_name='subweightSum'),
         Output('infrastructure-subweight-validation', 'children'),
         [Input('ev-gap-subweight', 'value'),
          Input('park-ride-subweight', 'value'),
          Input('government-subweight', 'value')]
     )
-    def validate_infrastructure_subweights(ev_gap, park_ride, government):
-        """Validate that infrastructure sub-weights sum to 100"""
-        if any(v is None for v in [ev_gap, park_ride, government]):
-            raise PreventUpdate
-
-        total = ev_gap + park_ride + government
 
-        if abs(total - 100) < 0.5:
-            return dbc.Alert([
-                html.I(className="fas fa-check-circle me-1"),
-                f"Sum: {total:.0f} ✓"
-            ], color="success", className="py-1 px-2 mb-0 small")
-        else:
-            return dbc.Alert([
-                html.I(className="fas fa-exclamation-triangle me-1"),
-                f"Sum: {total:.0f} (should be 100)"
-            ], color="warning", className="py-1 px-2 mb-0 small")
-
-    @app.callback(
+    app.clientside_callback(
+        ClientsideFunction(namespace='validation', function_name='subweightSum'),
         Output('accessibility-subweight-validation', 'children'),
         [Input('network-density-subweight', 'value'),
          Input('grocery-subweight', 'value'),
          Input('gas-station-subweight', 'value')]
     )
-    def validate_accessibility_subweights(network, grocery, gas_station):
-        """Validate that accessibility sub-weights sum to 100"""
-        if any(v is None for v in [network, grocery, gas_station]):
-            raise PreventUpdate
-
-        total = network + grocery + gas_station
-
-        if abs(total - 100) < 0.5:
-            return dbc.Alert([
-                html.I(className="fas fa-check-circle me-1"),
-                f"Sum: {total:.0f} ✓"
-            ], color="success", className="py-1 px-2 mb-0 small")
-        else:
-            return dbc.Alert([
-                html.I(className="fas fa-exclamation-triangle me-1"),
-                f"Sum: {total:.0f} (should be 100)"
-            ], color="warning", className="py-1 px-2 mb-0 small")
 
-
-    @app.callback(
+    # In the UI, subweights are "points" that should sum to 100.
+    # For Equity & Feasibility we expect: (ej + landuse + commercial) = 90, penalty = 10.
+    app.clientside_callback(
+        ClientsideFunction(namespace='validation', function_name='equitySubweights'),
         Output('equity-subweight-validation', 'children'),
         [Input('ej-priority-subweight', 'value'),
          Input('landuse-suit-subweight', 'value'),
          Input('commercial-subweight', 'value'),
          Input('protected-penalty-subweight', 'value')]
     )
-    def validate_equity_subweights(ej, landuse, commercial, protected):
-        """Validate that equity sub-weights sum appropriately"""
-        if any(v is None for v in [ej, landuse, commercial, protected]):
-            raise PreventUpdate
-        
-        positive_sum = ej + landuse + commercial
-
-        # In the UI, subweights are "points" that should sum to 100.
-        # For Equity & Feasibility we expect: (ej + landuse + commercial) = 90, penalty = 10.
-        if abs(positive_sum - 90) < 0.5 and abs(protected - 10) < 0.5:
-            return dbc.Alert([
-                html.I(className="fas fa-check-circle me-1"),
-                f"Positive weights: {positive_sum:.0f} ✓, Penalty: {protected:.0f}"
-            ], color="success", className="py-1 px-2 mb-0 small")
-        else:
-            return dbc.Alert([
-                html.I(className="fas fa-info-circle me-1"),
-                f"Positive: {positive_sum:.0f}, Penalty: {protected:.0f} (target: 90 / 10)"
-            ], color="info", className="py-1 px-2 mb-0 small")
 
     # ========================================================================
     # RESET SUB-WEIGHTS CALLBACKS
     # ========================================================================
 
+    # One callback for every category's reset button: each click restores that
+    # category's sliders and leaves the other categories untouched.
     @app.callback(
-        [Output('home-end-subweight', 'value'),
-         Output('workplace-end-subweight', 'value'),
-         Output('other-end-subweight', 'value'),
-         Output('weekday-subweight', 'value'),
-         Output('weekend-subweight', 'value'),
-         Output('equity-community-subweight', 'value'),
-         Output('non-equity-community-subweight', 'value'),
-         Output('temporal-stability-subweight', 'value'),
-         Output('temporal-peak-subweight', 'value')],
-        [Input('reset-demand-subweights-btn', 'n_clicks')]
-    )
-    def reset_demand_subweights(n_clicks):
-        # Reset demand sub-weights to defaults
-        if n_clicks is None:
-            raise PreventUpdate
-        # All subweights are expressed as 0–100 "points" and should sum to 100
-        # within each subfactor group.
-        return (
-            40, 40, 20,   # Trip purpose
-            70, 30,       # Day of week
-            50, 50,       # Equity vs non-equity
-            60, 40        # Temporal pattern
-        )
-
-    @app.callback(
-        [Output('ev-gap-subweight', 'value'),
-         Output('park-ride-subweight', 'value'),
-         Output('government-subweight', 'value')],
-        [Input('reset-infrastructure-subweights-btn', 'n_clicks')]
-    )
-    def reset_infrastructure_subweights(n_clicks):
-        """Reset infrastructure sub-weights to defaults"""
-        if n_clicks is None:
-            raise PreventUpdate
-        return (45, 30, 25)
-
-
-    @app.callback(
-        [Output('network-density-subweight', 'value'),
-         Output('grocery-subweight', 'value'),
-         Output('gas-station-subweight', 'value')],
-        [Input('reset-accessibility-subweights-btn', 'n_clicks')]
-    )
-    def reset_accessibility_subweights(n_clicks):
-        """Reset accessibility sub-weights to defaults"""
-        if n_clicks is None:
-            raise PreventUpdate
-        return (50, 25, 25)
-
-
-    @app.callback(
-        [Output('ej-priority-subweight', 'value'),
-         Output('landuse-suit-subweight', 'value'),
-         Output('commercial-subweight', 'value'),
-         Output('protected-penalty-subweight', 'value')],
-        [Input('reset-equity-subweights-btn', 'n_clicks')]
+        [Output(f'{name}-subweight', 'value')
+         for group in _SUBWEIGHT_DEFAULTS.values() for name, _ in group],
+        [Input({'type': 'reset-subweights', 'cat': ALL}, 'n_clicks')],
+        prevent_initial_call=True
     )
-    def reset_equity_subweights(n_clicks):
-        """Reset equity sub-weights to defaults"""
-        if n_clicks is None:
+    def reset_subweights(n_clicks):
+        """Reset the clicked category's sub-weights to defaults"""
+        cat = ctx.triggered_id['cat'] if ctx.triggered_id else None
+        if cat not in _SUBWEIGHT_DEFAULTS:
             raise PreventUpdate
-        # Positive weights should sum to 90; penalty should be 10.
-        return (40, 35, 15, 10)
+        return [
+            value if group_cat == cat else no_update
+            for group_cat, group in _SUBWEIGHT_DEFAULTS.items() for _, value in group
+        ]
 
     # ========================================================================
     # MAIN ANALYSIS CALLBACK
     # ========================================================================
 
     @app.callback(
-        [Output('scored-data-store', 'data'),
-         Output('selected-sites-store', 'data'),
-         Output('summary-metrics', 'children')],
-        [Input('run-analysis-btn', 'n_clicks')],
-        # Main category weights
-        [State(f'{cat}-weight', 'value') for cat in
-         ['demand', 'infrastructure', 'accessibility', 'equity']] +
-        
-        # DEMAND sub-weights
-        [State('home-end-subweight', 'value'),
-         State('workplace-end-subweight', 'value'),
-         State('other-end-subweight', 'value'),
-         State('weekday-subweight', 'value'),
-         State('weekend-subweight', 'value'),
-         State('equity-community-subweight', 'value'),
-         State('non-equity-community-subweight', 'value'),
-         State('temporal-stability-subweight', 'value'),
-         State('temporal-peak-subweight', 'value')] +
-
-        # INFRASTRUCTURE sub-weights
-        [State('ev-gap-subweight', 'value'),
-         State('park-ride-subweight', 'value'),
-         State('government-subweight', 'value')] +
-
-        
-        # ACCESSIBILITY sub-weights
-        [State('network-density-subweight', 'value'),
-         State('grocery-subweight', 'value'),
-         State('gas-station-subweight', 'value')] +
-
-        
-        # EQUITY sub-weights
-        [State('ej-priority-subweight', 'value'),
-         State('landuse-suit-subweight', 'value'),
-         State('commercial-subweight', 'value'),
-         State('protected-penalty-subweight', 'value')] +
-        
-        # Other parameters
-        [State('n-sites-input', 'value'),
-         State('min-distance-slider', 'value'),
-         State('min-person-input', 'value'),
-         State('secondary-buffer-toggle', 'value'),
-         State('rural-only-toggle', 'value'),
-         State('exclude-zero-headroom-toggle', 'value')]
+        output=[Output('scored-data-store', 'data'),
+                Output('selected-sites-store', 'data'),
+                Output('summary-metrics', 'children')],
+        inputs=dict(n_clicks=Input('run-analysis-btn', 'n_clicks')),
+        state=_RUN_ANALYSIS_STATE,
+        # The button is disabled while an analysis runs, so repeated clicks
+        # can't queue duplicate scoring runs behind it
+        running=[(Output('run-analysis-btn', 'disabled'), True, False)],
+        prevent_initial_call=True
     )
     def run_analysis(n_clicks, 
                      # Main weights
@@ -369,8 +462,25 @@ def register_callbacks(app):
                      n_sites, min_dist, min_person_trips, secondary_buffer_value, rural_only_value,
                      exclude_zero_headroom_value):
         """Execute site selection analysis"""
-        if n_clicks is None:
-            raise PreventUpdate
+        run_key = (
+            demand_w, infra_w, access_w, equity_w,
+            home_end_w, workplace_end_w, other_end_w, weekday_w, weekend_w,
+            equity_community_w, non_equity_community_w, temporal_stability_w, temporal_peak_w,
+            ev_gap_w, park_ride_w, government_w,
+            network_density_w, grocery_w, gas_station_w,
+            ej_priority_w, landuse_suit_w, commercial_w, protected_penalty_w,
+            n_sites, min_dist, min_person_trips,
+            bool(secondary_buffer_value), bool(rural_only_value), bool(exclude_zero_headroom_value)
+        )
+        with _RECENT_RUNS_LOCK:
+            previous = _RECENT_RUNS.get(run_key)
+            if previous is not None:
+                _RECENT_RUNS.move_to_end(run_key)
+        # Reuse only while both stored results can still be resolved
+        if previous is not None and all(
+                load_analysis_result(token) is not None for token in previous[:2]):
+            logger.info("Settings match a recent run → reusing previous analysis")
+            return previous
 
         try:
             # Validate main weights
@@ -383,133 +493,71 @@ def register_callbacks(app):
                 access_w *= factor
                 equity_w *= factor
 
-            # Get the cached selector
-            selector = get_selector()
+            with _ANALYSIS_LOCK:
+                # Get the cached selector
+                selector = get_selector()
 
-            # Update main category weights
-            selector.config['weights'] = {
-                'demand': demand_w / 100,
-                'infrastructure': infra_w / 100,
-                'accessibility': access_w / 100,
-                'equity_feasibility': equity_w / 100
-            }
+                # Update main category weights
+                selector.config['weights'] = dict(zip(
+                    _MAIN_WEIGHT_KEYS,
+                    (w / 100 for w in (demand_w, infra_w, access_w, equity_w))
+                ))
             
-            # ===== NEW: Update all sub-weights =====
+                # ===== NEW: Update all sub-weights =====
             
-            # Demand sub-weights
-            selector.config['demand_weights'] = {
-                # Trip purpose
-                'home_end_weight': home_end_w,
-                'workplace_end_weight': workplace_end_w,
-                'other_end_weight': other_end_w,
+                # Demand sub-weights
+                selector.config['demand_weights'] = dict(zip(_DEMAND_WEIGHT_KEYS, (
+                    home_end_w, workplace_end_w, other_end_w,
+                    weekday_w, weekend_w,
+                    equity_community_w, non_equity_community_w,
+                    temporal_stability_w, temporal_peak_w,
+                )))
+                selector.config['demand_component_weights'] = dict(_DEMAND_COMPONENT_WEIGHTS)
 
-                # Day of week
-                'weekday_weight': weekday_w,
-                'weekend_weight': weekend_w,
+                # Infrastructure / accessibility / equity sub-weights
+                selector.config['infrastructure_weights'] = _norm(
+                    (ev_gap_w, park_ride_w, government_w), _INFRA_WEIGHT_KEYS)
+                selector.config['accessibility_weights'] = _norm(
+                    (network_density_w, grocery_w, gas_station_w), _ACCESS_WEIGHT_KEYS)
+                selector.config['equity_weights'] = _norm(
+                    (ej_priority_w, landuse_suit_w, commercial_w, protected_penalty_w), _EQUITY_WEIGHT_KEYS)
 
-                # Equity vs non-equity trips
-                'equity_community_weight': equity_community_w,
-                'non_equity_community_weight': non_equity_community_w,
-
-                # Temporal pattern
-                'temporal_stability_weight': temporal_stability_w,
-                'temporal_peak_weight': temporal_peak_w
-            }
-
-            # Demand component weights (fixed design share; normalized in selector)
-            selector.config['demand_component_weights'] = {
-                'purpose': 0.35,
-                'day_of_week': 0.25,
-                'equity_trips': 0.20,
-                'temporal_pattern': 0.20
-            }
-
-            # Infrastructure sub-weights
-            infra_sub_sum = ev_gap_w + park_ride_w + government_w
-
-            if infra_sub_sum > 0:
-                selector.config['infrastructure_weights'] = {
-                    'truck_charger_gap_weight': (ev_gap_w / infra_sub_sum),
-                    'park_ride_weight': (park_ride_w / infra_sub_sum),
-                    'government_weight': (government_w / infra_sub_sum)
-                }
-            else:
-                # Treat all-zeros as "disable this section"
-                selector.config['infrastructure_weights'] = {
-                    'truck_charger_gap_weight': 0.0,
-                    'park_ride_weight': 0.0,
-                    'government_weight': 0.0
-                }
-
-            
-            # Accessibility sub-weights
-            access_sub_sum = network_density_w + grocery_w + gas_station_w
-            if access_sub_sum > 0:
-                selector.config['accessibility_weights'] = {
-                    'network_weight': network_density_w / access_sub_sum,
-                    'grocery_weight': grocery_w / access_sub_sum,
-                    'gas_station_weight': gas_station_w / access_sub_sum
-                }
-            else:
-                # Treat all-zeros as "disable this section"
-                selector.config['accessibility_weights'] = {
-                    'network_weight': 0.0,
-                    'grocery_weight': 0.0,
-                    'gas_station_weight': 0.0
-                }
-
-            
-            # Equity sub-weights
-            equity_sub_sum = ej_priority_w + landuse_suit_w + commercial_w + protected_penalty_w
-            if equity_sub_sum > 0:
-                selector.config['equity_weights'] = {
-                    'ej_priority_weight': ej_priority_w / equity_sub_sum,
-                    'landuse_suit_weight': landuse_suit_w / equity_sub_sum,
-                    'commercial_industrial_weight': commercial_w / equity_sub_sum,
-                    'protected_penalty_weight': protected_penalty_w / equity_sub_sum
-                }
-            else:
-                # Treat all-zeros as "disable this section"
-                selector.config['equity_weights'] = {
-                    'ej_priority_weight': 0.0,
-                    'landuse_suit_weight': 0.0,
-                    'commercial_industrial_weight': 0.0,
-                    'protected_penalty_weight': 0.0
-                }
-            
-            # ===== END sub-weights update =====
+                # ===== END sub-weights update =====
 
-            # Update feasibility constraints
-            selector.config['constraints']['min_person_trips'] = min_person_trips
+                # Update feasibility constraints
+                selector.config['constraints']['min_person_trips'] = min_person_trips
 
-            # NEW: Optional buffer constraint (checklist value is [] when off, ['within'] when on)
-            selector.config['constraints']['only_within_secondary_buffer'] = bool(secondary_buffer_value)
+                # NEW: Optional buffer constraint (checklist value is [] when off, ['within'] when on)
+                selector.config['constraints']['only_within_secondary_buffer'] = bool(secondary_buffer_value)
 
 
-            # Optional: only keep rural tracts
-            selector.config['constraints']['only_rural'] = bool(rural_only_value)
-            # Optional: remove tracts with 0 feeder headroom from feasible sites
-            selector.config['constraints']['exclude_zero_headroom'] = bool(exclude_zero_headroom_value)
+                # Optional: only keep rural tracts
+                selector.config['constraints']['only_rural'] = bool(rural_only_value)
+                # Optional: remove tracts with 0 feeder headroom from feasible sites
+                selector.config['constraints']['exclude_zero_headroom'] = bool(exclude_zero_headroom_value)
 
-            # Log the equity weights being used
-            logger.info(f"Equity weights applied: {selector.config['equity_weights']}")
+                # Log the equity weights being used
+                logger.info(f"Equity weights applied: {selector.config['equity_weights']}")
 
-            # Run scoring with updated configuration
-            logger.info("Calculating composite scores...")
-            scored_data = selector.calculate_composite_score()
+                # Run scoring with updated configuration
+                logger.info("Calculating composite scores...")
+                scored_data = selector.calculate_composite_score()
 
-            # Select optimal sites
-            logger.info(f"Selecting {n_sites} optimal sites...")
-            optimal_sites = selector.select_optimal_sites(
-                n_sites=int(n_sites),
-                min_distance_mi=float(min_dist) if min_dist is not None else 0
-            )
+                # Select optimal sites
+                logger.info(f"Selecting {n_sites} optimal sites...")
+                optimal_sites = selector.select_optimal_sites(
+                    n_sites=int(n_sites),
+                    min_distance_mi=float(min_dist) if min_dist is not None else 0
+                )
 
-            # Create summary metrics (unchanged)
-            feasible_count = len(scored_data[scored_data['feasible'] == True])
-            avg_score = scored_data[scored_data['feasible'] == True]['composite_score'].mean()
+            # Create summary metrics (one feasible mask shared by both, applied
+            # to the raw score array; NaN scores are skipped like Series.mean)
+            feasible_mask = (scored_data['feasible'] == True).to_numpy()
+            feasible_count = int(feasible_mask.sum())
+            feasible_scores = scored_data['composite_score'].to_numpy(dtype=float)[feasible_mask]
+            feasible_scores = feasible_scores[~np.isnan(feasible_scores)]
+            avg_score = float(feasible_scores.mean()) if len(feasible_scores) else float('nan')
 
-            from layout import create_metric_card
 
             metrics = dbc.Row([
                 dbc.Col([
@@ -546,26 +594,18 @@ def register_callbacks(app):
                 ], md=3)
             ])
 
-            # Convert to JSON
-            def gdf_to_json(gdf):
-                try:
-                    return json.dumps(gdf.__geo_interface__)
-                except:
-                    data_dict = gdf.drop(columns='geometry').to_dict('records')
-                    geoms = [geom.__geo_interface__ for geom in gdf.geometry]
-                    return json.dumps({
-                        'type': 'FeatureCollection',
-                        'features': [
-                            {'type': 'Feature', 'properties': props, 'geometry': geom}
-                            for props, geom in zip(data_dict, geoms)
-                        ]
-                    })
-
-            scored_json = gdf_to_json(scored_data)
-            optimal_json = gdf_to_json(optimal_sites)
+            # Keep the results server-side; the stores only carry tokens
+            scored_token = store_analysis_result(scored_data)
+            optimal_token = store_analysis_result(optimal_sites)
 
             logger.info("Analysis completed successfully")
-            return (scored_json, optimal_json, metrics)
+            result = (scored_token, optimal_token, metrics)
+            with _RECENT_RUNS_LOCK:
+                _RECENT_RUNS[run_key] = result
+                _RECENT_RUNS.move_to_end(run_key)
+                while len(_RECENT_RUNS) > _RECENT_RUNS_SIZE:
+                    _RECENT_RUNS.popitem(last=False)
+            return result
 
         except Exception as e:
             logger.error(f"Analysis failed: {e}", exc_info=True)
@@ -583,38 +623,58 @@ def register_callbacks(app):
     # ========================================================================
 
     # -----------------------------------------------------------------------
-    # CALLBACK A: Capture which tract-link was clicked and store its GEOID.
-    # This is intentionally separate from the map callback so that Dash's
-    # ALL-pattern trigger (fired when new tract-link components appear after
-    # a site-count change) never causes the map to zoom unexpectedly.
+    # CALLBACK A: Zoom the overview map to a clicked tract-link, in the browser
+    # (see assets/map_zoom.js). Only the view changes, so the clientside
+    # function re-centres the current figure from the tract-centroid-store
+    # filled alongside the rankings table. It ignores the ALL-pattern fire
+    # when new tract-link components appear after a site-count change, so the
+    # map never zooms unexpectedly.
     # -----------------------------------------------------------------------
-    @app.callback(
-        Output('clicked-geoid-store', 'data'),
+    app.clientside_callback(
+        ClientsideFunction(namespace='map', function_name='zoomToTract'),
+        Output('map-container', 'children', allow_duplicate=True),
         Input({'type': 'tract-link', 'index': ALL}, 'n_clicks'),
-        State({'type': 'tract-link', 'index': ALL}, 'id'),
+        [State('tract-centroid-store', 'data'),
+         State('map-container', 'children')],
         prevent_initial_call=True
     )
-    def store_clicked_geoid(n_clicks_list, id_list):
-        """
-        Translate a tract-link click into a stored GEOID string.
-        Only fires when the user genuinely clicks a link (n_clicks > 0).
-        """
-        if not n_clicks_list or not any(n for n in n_clicks_list if n):
-            raise PreventUpdate
 
-        triggered_id = dash.callback_context.triggered_id
-        if not isinstance(triggered_id, dict) or triggered_id.get('type') != 'tract-link':
-            raise PreventUpdate
+    # Results behind a token never change, so the overview figure for a token
+    # pair is built once; repeat renders (e.g. an unchanged re-run, which keeps
+    # its tokens) only re-wrap it in a fresh dcc.Graph.
+    @lru_cache(maxsize=4)
+    def _overview_figure(scored_token, optimal_token):
+        """Build the overview map figure for a pair of result tokens"""
+        scored_gdf = _store_to_gdf(scored_token)
+        optimal_gdf = _store_to_gdf(optimal_token)
+
+        # ── CALLBACK SANITY A ─────────────────────────────────────────────
+        logger.info(
+            f"[CALLBACK SANITY A] update_overview_map │ "
+            f"optimal_rows={len(optimal_gdf)} │ "
+            f"scored_rows={len(scored_gdf)}"
+        )
+        # ── END CALLBACK SANITY A ─────────────────────────────────────────
 
-        clicked_geoid = triggered_id.get('index')
-        if clicked_geoid is None:
-            raise PreventUpdate
+        fig = create_optimal_sites_map(scored_gdf, optimal_gdf)
 
-        return str(clicked_geoid)
+        # ── CALLBACK SANITY B ─────────────────────────────────────────────
+        try:
+            _st = next((t for t in fig.data if getattr(t,'name','')=='Optimal Sites'), None)
+            _sc = len(_st.lat) if _st else 0
+            logger.info(
+                f"[CALLBACK SANITY B] Figure received │ "
+                f"star_markers={_sc} │ expected={len(optimal_gdf)} │ "
+                f"{'✓ MATCH' if _sc == len(optimal_gdf) else '⚠ MISMATCH'}"
+            )
+        except Exception as _e:
+            logger.error(f"[CALLBACK SANITY B] failed: {_e}")
+        # ── END CALLBACK SANITY B ─────────────────────────────────────────
+
+        return fig
 
     # -----------------------------------------------------------------------
-    # CALLBACK B: Rebuild the map when analysis data changes, OR zoom when
-    # the user clicks a tract-link.
+    # CALLBACK B: Rebuild the map when analysis data changes.
     #
     # WHY map-container + unique id (not overview-map figure):
     # All sanity checks confirmed the server builds a perfect figure every
@@ -630,20 +690,18 @@ def register_callbacks(app):
     @app.callback(
         Output('map-container', 'children'),
         [Input('scored-data-store', 'data'),
-         Input('selected-sites-store', 'data'),
-         Input('clicked-geoid-store', 'data')],
+         Input('selected-sites-store', 'data')],
     )
-    def update_overview_map(scored_json, optimal_json, clicked_geoid):
+    def update_overview_map(scored_token, optimal_token):
         """
         Returns a fresh dcc.Graph with a unique id on every run.
         The id change forces React to fully remount the component,
         guaranteeing the correct number of site markers is always shown.
         """
-        import time as _time
 
         def _wrap(fig):
             """Return a dcc.Graph with a unique id so React always remounts."""
-            unique_id = f'overview-map-{int(_time.time() * 1000)}'
+            unique_id = f'overview-map-{int(time.time() * 1000)}'
             logger.info(f"[CALLBACK SANITY C] Wrapping graph with id='{unique_id}'")
             return dcc.Graph(
                 id=unique_id,
@@ -651,107 +709,80 @@ def register_callbacks(app):
                 config={'displayModeBar': True, 'displaylogo': False}
             )
 
-        if scored_json is None or optimal_json is None:
+        if scored_token is None or optimal_token is None:
             logger.info("[MAP] Stores empty → returning initial map")
-            return _wrap(create_initial_map())
+            return _wrap(initial_map)
 
         try:
-            scored_gdf = gpd.GeoDataFrame.from_features(json.loads(scored_json))
-            optimal_gdf = gpd.GeoDataFrame.from_features(json.loads(optimal_json))
-
-            if scored_gdf.crs is None:
-                scored_gdf.set_crs('EPSG:4326', inplace=True)
-            if optimal_gdf.crs is None:
-                optimal_gdf.set_crs('EPSG:4326', inplace=True)
-
-            # ── CALLBACK SANITY A ─────────────────────────────────────────────
-            triggered_id = dash.callback_context.triggered_id
-            logger.info(
-                f"[CALLBACK SANITY A] update_overview_map │ "
-                f"trigger='{triggered_id}' │ "
-                f"optimal_rows={len(optimal_gdf)} │ "
-                f"scored_rows={len(scored_gdf)}"
-            )
-            # ── END CALLBACK SANITY A ─────────────────────────────────────────
-
-            fig = create_optimal_sites_map(scored_gdf, optimal_gdf)
-
-            # ── CALLBACK SANITY B ─────────────────────────────────────────────
-            try:
-                _st = next((t for t in fig.data if getattr(t,'name','')=='Optimal Sites'), None)
-                _sc = len(_st.lat) if _st else 0
-                logger.info(
-                    f"[CALLBACK SANITY B] Figure received │ "
-                    f"star_markers={_sc} │ expected={len(optimal_gdf)} │ "
-                    f"{'✓ MATCH' if _sc == len(optimal_gdf) else '⚠ MISMATCH'}"
-                )
-            except Exception as _e:
-                logger.error(f"[CALLBACK SANITY B] failed: {_e}")
-            # ── END CALLBACK SANITY B ─────────────────────────────────────────
-
-            # Zoom to clicked tract if triggered by a link click
-            if triggered_id == 'clicked-geoid-store' and clicked_geoid:
-                clicked_geoid_str = str(clicked_geoid)
-                target = None
-                if 'GEOID' in scored_gdf.columns:
-                    target = scored_gdf[scored_gdf['GEOID'].astype(str) == clicked_geoid_str]
-                if (target is None or len(target) == 0) and 'GEOID' in optimal_gdf.columns:
-                    target = optimal_gdf[optimal_gdf['GEOID'].astype(str) == clicked_geoid_str]
-                if target is not None and len(target) > 0:
-                    try:
-                        centroid = target.geometry.iloc[0].centroid
-                        fig.update_layout(mapbox=dict(
-                            center={'lat': float(centroid.y), 'lon': float(centroid.x)},
-                            zoom=11
-                        ))
-                    except Exception:
-                        pass
-
-            return _wrap(fig)
+            return _wrap(_overview_figure(scored_token, optimal_token))
 
         except Exception as e:
             logger.error(f"Error updating overview map: {e}", exc_info=True)
-            return _wrap(create_initial_map())
+            return _wrap(initial_map)
 
     # ========================================================================
     # SITE RANKINGS TABLE CALLBACK
     # ========================================================================
 
     @app.callback(
-        Output('site-rankings-table', 'children'),
+        [Output('site-rankings-table', 'children'),
+         Output('tract-centroid-store', 'data')],
         [Input('selected-sites-store', 'data')]
     )
-    def update_site_rankings(optimal_json):
-        """Create detailed rankings table for selected sites WITH CHARGING TYPE"""
-        if optimal_json is None:
+    def update_site_rankings(optimal_token):
+        """Create detailed rankings table for selected sites WITH CHARGING TYPE,
+        plus the GEOID -> [lat, lon] map centres its tract links zoom to"""
+        if optimal_token is None:
             return html.P("Run analysis to see selected sites",
-                          className="text-muted text-center")
+                          className="text-muted text-center"), None
 
         try:
-            optimal_gdf = gpd.GeoDataFrame.from_features(json.loads(optimal_json))
+            # The table only needs attributes, never the tract polygons
+            df = _store_columns(optimal_token, _RANKINGS_COLS)
 
-            if len(optimal_gdf) == 0:
-                return html.P("No sites selected", className="text-muted text-center")
+            if len(df) == 0:
+                return html.P("No sites selected", className="text-muted text-center"), None
 
-            # Define charging type display formatting
-            # NOTE: In this secondary-corridor tool, `charging_type` is currently the
-            # long-distance-share classifier from the console log (long_distance vs other).
-            # Keep the mapping explicit so the table doesn't default to "Unclassified".
-            type_icons = {
-                'long_distance': ('🛣️', 'Long-distance', 'warning'),
-                'other': ('🏙️', 'Other', 'secondary'),
-                'unclassified': ('❓', 'Unclassified', 'secondary')
-            }
+            # Precompute every column once, then build rows in a plain zip loop
+            df = df.reset_index(drop=True)
+            n_rows = len(df)
+
+            if 'charging_type' in df.columns:
+                ctypes = df['charging_type'].astype(str).str.strip().str.lower()
+                ctypes = ctypes.where(ctypes.isin(list(_TYPE_ICONS)), 'unclassified').tolist()
+            else:
+                ctypes = ['unclassified'] * n_rows
+
+            if 'GEOID' in df.columns:
+                geoids = df['GEOID'].tolist()
+                geoid_ids = df['GEOID'].astype(str).tolist()
+            else:
+                geoids = [f'Tract {i}' for i in range(n_rows)]
+                geoid_ids = [str(i) for i in range(n_rows)]
+
+            centroids = {}
+            for geoid_id in geoid_ids:
+                center = get_result_centroid(optimal_token, geoid_id)
+                if center:
+                    centroids[geoid_id] = [round(center[0], 5), round(center[1], 5)]
+
+            composite = df['composite_score'].tolist()
+            composite_labels = df['composite_score'].map('{:.1f}'.format).tolist()
+            composite_colors = get_score_colors(composite)
+
+            component_cols = zip(
+                _format_column(df, 'demand_score'),
+                _format_column(df, 'infrastructure_score'),
+                _format_column(df, 'accessibility_score'),
+                _format_column(df, 'equity_feasibility_score')
+            )
 
             # Create table rows
             rows = []
-            for idx, row in optimal_gdf.iterrows():
-                raw_ctype = row.get('charging_type', None)
-                ctype = str(raw_ctype).strip().lower() if raw_ctype is not None else ''
-                if ctype in ('', 'none', 'nan'):
-                    ctype = 'unclassified'
-                icon, type_label, badge_color = type_icons.get(ctype, type_icons['unclassified'])
-                
+            for idx, (ctype, geoid, geoid_id, score, score_label, score_color,
+                      (demand, infra, access, equity)) in enumerate(zip(
+                    ctypes, geoids, geoid_ids, composite, composite_labels,
+                    composite_colors, component_cols)):
                 rows.append(
                     html.Tr([
                         html.Td(
@@ -760,47 +791,27 @@ def register_callbacks(app):
                         ),
                         html.Td(
                             html.A(
-                                row.get('GEOID', f'Tract {idx}'),
+                                geoid,
                                 href="#",
-                                id={'type': 'tract-link', 'index': str(row.get('GEOID', f'{idx}'))},
+                                id={'type': 'tract-link', 'index': geoid_id},
                                 n_clicks=0,
                                 className="font-monospace small"
                             )
                         ),
-                        html.Td([
-                            html.Span(icon, className="me-1"),
-                            dbc.Badge(type_label, color=badge_color, className="me-2"),
-                        ], className="text-nowrap"),
+                        _charging_type_cell(ctype),
                         html.Td(
                             dbc.Progress(
-                                value=row['composite_score'],
-                                label=f"{row['composite_score']:.1f}",
-                                color=get_score_color(row['composite_score']),
+                                value=score,
+                                label=score_label,
+                                color=score_color,
                                 className="mb-0",
                                 style={"height": "25px"}
                             )
                         ),
-                        
-                        # # Add a column for context
-                        # html.Td([
-                            # html.Span(
-                                # "🏙️" if row.get('urban_rural_context') == 'urban' else
-                                # "🌳" if row.get('urban_rural_context') == 'rural' else
-                                # "🏘️" if row.get('urban_rural_context') == 'mixed' else "❓",
-                                # className="me-1"
-                            # ),
-                            # row.get('urban_rural_context', 'Unknown').title()
-                        # ], className="small"),
-                        
-                        
-                        html.Td(f"{row.get('demand_score', 0):.1f}",
-                                className="text-center"),
-                        html.Td(f"{row.get('infrastructure_score', 0):.1f}",
-                                className="text-center"),
-                        html.Td(f"{row.get('accessibility_score', 0):.1f}",
-                                className="text-center"),
-                        html.Td(f"{row.get('equity_feasibility_score', 0):.1f}",
-                                className="text-center")
+                        html.Td(demand, className="text-center"),
+                        html.Td(infra, className="text-center"),
+                        html.Td(access, className="text-center"),
+                        html.Td(equity, className="text-center")
                     ], className="align-middle")
                 )
 
@@ -819,10 +830,10 @@ def register_callbacks(app):
                 ),
                 html.Tbody(rows)
             ], bordered=True, hover=True, responsive=True, striped=True,
-                className="mb-0")
+                className="mb-0"), centroids
         except Exception as e:
             logger.error(f"Error creating rankings table: {e}", exc_info=True)
-            return html.P(f"Error: {str(e)}", className="text-danger")
+            return html.P(f"Error: {str(e)}", className="text-danger"), None
 
     # ========================================================================
     # ANALYTICS CHARTS CALLBACKS
@@ -835,22 +846,22 @@ def register_callbacks(app):
         [Input('scored-data-store', 'data'),
          Input('selected-sites-store', 'data')]
     )
-    def update_analytics(scored_json, optimal_json):
+    def update_analytics(scored_token, optimal_token):
         """Update all analytics visualizations"""
-        if scored_json is None:
-            empty = create_empty_figure("Run analysis first")
+        if scored_token is None:
+            empty = empty_run_analysis
             return empty, empty, empty
 
         try:
-            scored_gdf = gpd.GeoDataFrame.from_features(json.loads(scored_json))
-            optimal_gdf = (gpd.GeoDataFrame.from_features(json.loads(optimal_json))
-                           if optimal_json else None)
+            scored_gdf = _store_columns(scored_token, _ANALYTICS_COLS)
+            optimal_gdf = (_store_columns(optimal_token, _COMPONENT_SCORE_COLS)
+                           if optimal_token else None)
 
             return (
                 create_score_distribution_chart(scored_gdf),
                 create_component_comparison_chart(scored_gdf, top_n=20),
                 create_radar_chart(optimal_gdf) if optimal_gdf is not None
-                else create_empty_figure("No sites selected")
+                else empty_no_sites
             )
         except Exception as e:
             logger.error(f"Error updating analytics: {e}", exc_info=True)
@@ -862,17 +873,14 @@ def register_callbacks(app):
     # ========================================================================
 
     @app.callback(
-        [Output(f'{cat}-weight', 'value') for cat in
-         ['demand', 'infrastructure', 'accessibility', 'equity']] +
+        [Output(f'{cat}-weight', 'value') for cat in _WEIGHT_CATS] +
         [Output('n-sites-input', 'value'),
          Output('min-person-input', 'value')],
-        [Input('reset-btn', 'n_clicks')]
+        [Input('reset-btn', 'n_clicks')],
+        prevent_initial_call=True
     )
     def reset_configuration(n_clicks):
         # Reset all inputs to default values
-        if n_clicks is None:
-            raise PreventUpdate
-
         return (
             40, 25, 20, 15,  # Weights
             4,               # n_sites
@@ -883,17 +891,13 @@ def register_callbacks(app):
     # ========================================================================
     # STOP DURATION CALLBACKS
     # ========================================================================
+    # These summarize the loaded tract data, not an analysis result, yet fire on
+    # every tab switch. Outputs are built once per (selector, gdf_version); a
+    # reloaded or reassigned frame gets a new key.
 
-    @app.callback(
-        [
-            Output('avg-stop-duration', 'children'),
-            Output('pct-eligible-trips', 'children')
-        ],
-        Input('outer-tabs', 'active_tab')  # Trigger on tab load
-    )
-    def update_stop_duration_metrics(_):
-        """Display overall stop duration statistics"""
-        selector = get_selector()
+    @lru_cache(maxsize=2)
+    def _stop_duration_metrics(selector, gdf_version):
+        """Headline stop-duration numbers for one version of the tract data"""
         gdf = selector.gdf
         
         avg_stop = gdf['avg_stop_duration_minutes'].mean()
@@ -903,22 +907,33 @@ def register_callbacks(app):
     
     
     @app.callback(
-        Output('stop-duration-histogram', 'figure'),
-        Input('outer-tabs', 'active_tab')
+        [
+            Output('avg-stop-duration', 'children'),
+            Output('pct-eligible-trips', 'children')
+        ],
+        Input('outer-tabs', 'active_tab')  # Trigger on tab load
     )
-    def create_stop_duration_histogram(_):
-        """Create histogram showing distribution of average stop durations"""
-        import plotly.graph_objects as go
-        
+    def update_stop_duration_metrics(_):
+        """Display overall stop duration statistics"""
         selector = get_selector()
+        return _stop_duration_metrics(selector, selector.gdf_version)
+
+
+    @lru_cache(maxsize=2)
+    def _stop_duration_histogram(selector, gdf_version):
+        """Stop-duration histogram for one version of the tract data"""
         gdf = selector.gdf
         
         # Create histogram
         fig = go.Figure()
         
-        fig.add_trace(go.Histogram(
-            x=gdf['avg_stop_duration_minutes'],
-            nbinsx=30,
+        # Binned here so the browser gets 30 bar heights, not every tract's value
+        durations = gdf['avg_stop_duration_minutes'].dropna().to_numpy(dtype=float)
+        counts, edges = np.histogram(durations, bins=30)
+        fig.add_trace(go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=counts,
+            width=np.diff(edges),
             name='Tracts',
             marker_color='steelblue',
             hovertemplate='Stop Duration: %{x:.0f} min<br>Count: %{y}<extra></extra>'
@@ -956,92 +971,73 @@ def register_callbacks(app):
     
     
     @app.callback(
-        Output('stop-duration-stats-table', 'children'),
+        Output('stop-duration-histogram', 'figure'),
         Input('outer-tabs', 'active_tab')
     )
-    def create_stop_duration_stats_table(_):
-        """Create summary statistics table for stop duration"""
-        
+    def create_stop_duration_histogram(_):
+        """Create histogram showing distribution of average stop durations"""
         selector = get_selector()
+        return _stop_duration_histogram(selector, selector.gdf_version)
+
+
+    @lru_cache(maxsize=2)
+    def _stop_duration_stats_table(selector, gdf_version):
+        """Stop-duration category table for one version of the tract data"""
         gdf = selector.gdf
         
         # Calculate statistics by stop duration category
-        stats = []
-        
-        categories = [
-            ("< 30 min", 0, 30, "Not viable"),
-            ("30-60 min", 30, 60, "Good for Level 2"),
-            ("60-120 min", 60, 120, "Ideal for DC Fast"),
-            ("> 120 min", 120, 999, "Extended stops")
-        ]
-        
-        for label, min_dur, max_dur, desc in categories:
-            mask = (gdf['avg_stop_duration_minutes'] >= min_dur) & \
-                   (gdf['avg_stop_duration_minutes'] < max_dur)
-            
-            tracts_count = mask.sum()
-            trips_count = gdf.loc[mask, 'charging_eligible_trip_ends'].sum()
-            pct_tracts = 100 * tracts_count / len(gdf)
-            
-            stats.append({
-                'Duration': label,
-                'Description': desc,
-                'Tracts': tracts_count,
-                '% of Tracts': f"{pct_tracts:.1f}%",
-                'Eligible Trips': f"{trips_count:,.0f}"
-            })
+        labels = ["< 30 min", "30-60 min", "60-120 min", "> 120 min"]
+        descriptions = ["Not viable", "Good for Level 2", "Ideal for DC Fast", "Extended stops"]
+        
+        # One binning pass; [lo, hi) buckets, values outside 0-999 fall in none
+        buckets = pd.cut(gdf['avg_stop_duration_minutes'], bins=[0, 30, 60, 120, 999],
+                         labels=labels, right=False)
+        agg = gdf['charging_eligible_trip_ends'].groupby(buckets, observed=False).agg(['size', 'sum'])
+        
+        stats = pd.DataFrame({
+            'Duration': labels,
+            'Description': descriptions,
+            'Tracts': agg['size'].to_numpy(),
+            '% of Tracts': (100 * agg['size'] / len(gdf)).map('{:.1f}%'.format).to_numpy(),
+            'Eligible Trips': agg['sum'].map('{:,.0f}'.format).to_numpy()
+        })
         
         # Create Bootstrap table
         return dbc.Table.from_dataframe(
-            pd.DataFrame(stats),
+            stats,
             striped=True,
             bordered=True,
             hover=True,
             responsive=True,
             size='sm'
         )
+
+
+    @app.callback(
+        Output('stop-duration-stats-table', 'children'),
+        Input('outer-tabs', 'active_tab')
+    )
+    def create_stop_duration_stats_table(_):
+        """Create summary statistics table for stop duration"""
+        selector = get_selector()
+        return _stop_duration_stats_table(selector, selector.gdf_version)
         
         
-    @app.callback(
+    app.clientside_callback(
+        ClientsideFunction(namespace='validation', function_name='subweightSum'),
         Output('temporal-subweight-validation', 'children'),
         [Input('temporal-stability-subweight', 'value'),
          Input('temporal-peak-subweight', 'value')]
     )
-    def validate_temporal_subweights(stability, peak):
-        # Validate that temporal sub-weights sum to 100
-        if any(v is None for v in [stability, peak]):
-            raise PreventUpdate
-
-        total = stability + peak
-
-        if abs(total - 100) < 0.5:
-            return dbc.Alert([
-                html.I(className="fas fa-check-circle me-1"),
-                f"Sum: {total:.0f} ✓"
-            ], color="success", className="py-1 px-2 mb-0 small")
-        else:
-            return dbc.Alert([
-                html.I(className="fas fa-exclamation-triangle me-1"),
-                f"Sum: {total:.0f} (should be 100)"
-            ], color="warning", className="py-1 px-2 mb-0 small")
 
 
     # ========================================================================
     # TEMPORAL DEMAND PATTERN CALLBACKS
     # ========================================================================
 
-    @app.callback(
-        [
-            Output('avg-demand-uniformity', 'children'),
-            Output('avg-peak-intensity', 'children'),
-            Output('stable-sites-count', 'children'),  # NEW
-            Output('recommended-charging-breakdown', 'children')
-        ],
-        Input('outer-tabs', 'active_tab')
-    )
-    def update_temporal_metrics(_):
-        """Display overall temporal demand pattern statistics"""
-        selector = get_selector()
+    @lru_cache(maxsize=2)
+    def _temporal_metrics(selector, gdf_version):
+        """Temporal demand summary for one version of the tract data (see STOP DURATION)"""
         gdf = selector.gdf
         
         # Calculate averages
@@ -1064,38 +1060,72 @@ def register_callbacks(app):
         return f"{avg_uniformity:.1f}", f"{avg_peak:.2f}x", str(stable_count), breakdown_html
 
 
+    @app.callback(
+        [
+            Output('avg-demand-uniformity', 'children'),
+            Output('avg-peak-intensity', 'children'),
+            Output('stable-sites-count', 'children'),  # NEW
+            Output('recommended-charging-breakdown', 'children')
+        ],
+        Input('outer-tabs', 'active_tab')
+    )
+    def update_temporal_metrics(_):
+        """Display overall temporal demand pattern statistics"""
+        selector = get_selector()
+        return _temporal_metrics(selector, selector.gdf_version)
+
+
+    def _thin_scatter(x, y, max_points):
+        """
+        Positions of at most max_points of the (x, y) points: the first point in
+        each occupied cell of a square grid over their range. Keeps where the
+        points fall (and an unbiased sample of their colors) at a fraction of
+        the payload. Points with a missing coordinate are dropped.
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        finite = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+        if len(finite) == 0:
+            return finite
+        side = int(np.sqrt(max_points))
+
+        def _cell(v):
+            lo, span = v.min(), np.ptp(v) or 1.0
+            return np.minimum(((v - lo) / span * side).astype(np.int64), side - 1)
+
+        cells = _cell(x[finite]) * side + _cell(y[finite])
+        _, first = np.unique(cells, return_index=True)
+        return finite[np.sort(first)]
+
+
     @app.callback(
         Output('temporal-pattern-scatter', 'figure'),
         [Input('scored-data-store', 'data'),  # Make sure this is scored-data-store
          Input('selected-sites-store', 'data')]
     )
-    def create_temporal_scatter(scored_json, optimal_json):
+    def create_temporal_scatter(scored_token, optimal_token):
         """Create scatter plot of temporal stability vs peak intensity"""
-        import plotly.graph_objects as go
-        
-        if scored_json is None:
-            return create_empty_figure("Run analysis first")
+        if scored_token is None:
+            return empty_run_analysis
         
         try:
-            scored_gdf = gpd.GeoDataFrame.from_features(json.loads(scored_json))
+            scored_gdf = _store_columns(scored_token, _TEMPORAL_SCATTER_COLS)
             
             # Filter to feasible sites only
-            feasible = scored_gdf[scored_gdf['feasible'] == True].copy()
+            feasible = scored_gdf[scored_gdf['feasible'] == True]
             
             if len(feasible) == 0:
                 return create_empty_figure("No feasible sites")
             
             # Check which column name exists
+            fallback_cols = []
             if 'heavy_duty_demand_uniformity' in feasible.columns:
                 uniformity_col = 'heavy_duty_demand_uniformity'
             elif 'demand_uniformity' in feasible.columns:
                 uniformity_col = 'demand_uniformity'
             else:
-                # Fallback: get from selector
-                selector = get_selector()
-                full_data = selector.gdf[selector.gdf['GEOID'].isin(feasible['GEOID'])]
-                feasible['heavy_duty_demand_uniformity'] = full_data['heavy_duty_demand_uniformity'].values
                 uniformity_col = 'heavy_duty_demand_uniformity'
+                fallback_cols.append(uniformity_col)
             
             # Check for peak ratio column
             if 'heavy_duty_peak_to_avg_ratio' in feasible.columns:
@@ -1103,11 +1133,21 @@ def register_callbacks(app):
             elif 'temporal_peak_intensity' in feasible.columns:
                 peak_col = 'temporal_peak_intensity'
             else:
-                # Fallback: get from selector
-                selector = get_selector()
-                full_data = selector.gdf[selector.gdf['GEOID'].isin(feasible['GEOID'])]
-                feasible['heavy_duty_peak_to_avg_ratio'] = full_data['heavy_duty_peak_to_avg_ratio'].values
                 peak_col = 'heavy_duty_peak_to_avg_ratio'
+                fallback_cols.append(peak_col)
+            
+            if fallback_cols:
+                # Fallback: get both from the selector in one GEOID-aligned lookup
+                lookup = get_selector().columns_for_geoids(feasible['GEOID'], fallback_cols)
+                feasible = feasible.assign(**{col: lookup[col].to_numpy() for col in fallback_cols})
+            
+            # Large feasible sets are thinned to one representative per grid cell
+            trace_name = 'All Feasible Sites'
+            if len(feasible) > _TEMPORAL_SCATTER_MAX_POINTS:
+                n_feasible = len(feasible)
+                feasible = feasible.iloc[_thin_scatter(
+                    feasible[uniformity_col], feasible[peak_col], _TEMPORAL_SCATTER_MAX_POINTS)]
+                trace_name = f'Feasible Sites ({len(feasible):,} of {n_feasible:,} shown)'
             
             # Create scatter plot
             fig = go.Figure()
@@ -1117,7 +1157,7 @@ def register_callbacks(app):
                 x=feasible[uniformity_col],
                 y=feasible[peak_col], 
                 mode='markers',
-                name='All Feasible Sites',
+                name=trace_name,
                 marker=dict(
                     size=8,
                     color=feasible['demand_score'],
@@ -1136,9 +1176,9 @@ def register_callbacks(app):
             ))
             
             # Add selected sites if available
-            if optimal_json:
+            if optimal_token:
                 try:
-                    optimal_gdf = gpd.GeoDataFrame.from_features(json.loads(optimal_json))
+                    optimal_gdf = _store_columns(optimal_token, ('GEOID', uniformity_col, peak_col))
                     
                     # Get uniformity and peak for optimal sites
                     if uniformity_col in optimal_gdf.columns and peak_col in optimal_gdf.columns:
@@ -1146,8 +1186,9 @@ def register_callbacks(app):
                         opt_peak = optimal_gdf[peak_col]
                     else:
                         # Get from selector
-                        selector = get_selector()
-                        full_data = selector.gdf[selector.gdf['GEOID'].isin(optimal_gdf['GEOID'])]
+                        full_data = get_selector().columns_for_geoids(
+                            optimal_gdf['GEOID'],
+                            ['heavy_duty_demand_uniformity', 'heavy_duty_peak_to_avg_ratio'])
                         opt_uniformity = full_data['heavy_duty_demand_uniformity'].values
                         opt_peak = full_data['heavy_duty_peak_to_avg_ratio'].values
                     
@@ -1209,7 +1250,6 @@ def register_callbacks(app):
             
         except Exception as e:
             logger.error(f"Error creating temporal scatter: {e}", exc_info=True)
-            import traceback
             traceback.print_exc()
             return create_empty_figure(f"Error: {str(e)}")
 
@@ -1218,19 +1258,17 @@ def register_callbacks(app):
         Output('temporal-tod-heatmap', 'figure'),
         [Input('selected-sites-store', 'data')]
     )
-    def create_temporal_tod_heatmap(optimal_json):
+    def create_temporal_tod_heatmap(optimal_token):
         """Create heatmap showing time-of-day patterns for selected sites"""
-        import plotly.graph_objects as go
-        
-        if optimal_json is None:
+        if optimal_token is None:
             return create_empty_figure("Run analysis to see selected sites")
         
         try:
-            optimal_gdf = gpd.GeoDataFrame.from_features(json.loads(optimal_json))
+            optimal_gdf = _store_to_gdf(optimal_token)
             selector = get_selector()
             
             if len(optimal_gdf) == 0:
-                return create_empty_figure("No sites selected")
+                return empty_no_sites
             
             # Get time-of-day columns
             tod_cols = [
@@ -1287,22 +1325,20 @@ def register_callbacks(app):
         Output('charging-type-suitability-chart', 'figure'),
         [Input('selected-sites-store', 'data')]
     )
-    def create_suitability_comparison(optimal_json):
+    def create_suitability_comparison(optimal_token):
         """Create grouped bar chart comparing suitability scores for each selected site"""
-        import plotly.graph_objects as go
-        
-        if optimal_json is None:
+        if optimal_token is None:
             return create_empty_figure("Run analysis to see selected sites")
         
         try:
-            optimal_gdf = gpd.GeoDataFrame.from_features(json.loads(optimal_json))
+            optimal_gdf = _store_to_gdf(optimal_token)
             
             if len(optimal_gdf) == 0:
-                return create_empty_figure("No sites selected")
+                return empty_no_sites
             
             # Create site labels
-            site_labels = [f"Site #{i+1}<br>{row['GEOID'][:8]}..." 
-                           for i, (_, row) in enumerate(optimal_gdf.iterrows())]
+            site_labels = [f"Site #{i+1}<br>{geoid[:8]}..."
+                           for i, geoid in enumerate(optimal_gdf['GEOID'].tolist())]
             
             # Create traces for each suitability type
             fig = go.Figure()
@@ -1370,18 +1406,18 @@ def register_callbacks(app):
         ],
         Input('scored-data-store', 'data')  # ← Keep this
     )
-    def update_charging_type_metrics(scored_json):  # ← CHANGE parameter name
+    def update_charging_type_metrics(scored_token):  # ← CHANGE parameter name
         """Display charging type distribution statistics"""
-        if scored_json is None:  # ← CHANGE variable name
+        if scored_token is None:  # ← CHANGE variable name
             return "0", "0", "0", "0"
         
         try:
-            # Parse JSON to GeoDataFrame
-            scored_gdf = gpd.GeoDataFrame.from_features(json.loads(scored_json))  # ← PARSE JSON
+            scored_gdf = _store_columns(scored_token, _CHARGING_TYPE_COLS)
             feasible = scored_gdf[scored_gdf['feasible'] == True]
             
-            long_count = (feasible['charging_type'] == 'long_distance').sum()
-            other_count = (feasible['charging_type'] == 'other').sum()
+            type_counts = feasible['charging_type'].value_counts()
+            long_count = int(type_counts.get('long_distance', 0))
+            other_count = int(type_counts.get('other', 0))
             
             # Keep 4-card layout; last two are placeholders
             return str(long_count), str(other_count), "0", "0"
@@ -1395,15 +1431,13 @@ def register_callbacks(app):
         [Input('scored-data-store', 'data'),
          Input('selected-sites-store', 'data')]
     )
-    def create_charging_type_breakdown(scored_json, optimal_json):
+    def create_charging_type_breakdown(scored_token, optimal_token):
         """Create pie chart showing charging type distribution"""
-        import plotly.graph_objects as go
-        
-        if scored_json is None:
-            return create_empty_figure("Run analysis first")
+        if scored_token is None:
+            return empty_run_analysis
         
         try:
-            scored_gdf = gpd.GeoDataFrame.from_features(json.loads(scored_json))
+            scored_gdf = _store_columns(scored_token, _CHARGING_TYPE_COLS)
             feasible = scored_gdf[scored_gdf['feasible'] == True]
             
             # Count by type
@@ -1440,8 +1474,8 @@ def register_callbacks(app):
             )])
             
             # Add selected sites overlay if available
-            if optimal_json:
-                optimal_gdf = gpd.GeoDataFrame.from_features(json.loads(optimal_json))
+            if optimal_token:
+                optimal_gdf = _store_columns(optimal_token, ('charging_type',))
                 selected_types = optimal_gdf['charging_type'].value_counts()
                 
                 fig.add_annotation(
@@ -1483,22 +1517,22 @@ def register_callbacks(app):
         [Input('scored-data-store', 'data'),  # ← Keep this
          Input('charging-type-filter', 'value')]
     )
-    def create_charging_type_map(scored_json, filter_value):  # ← Already correct!
+    # Choropleths depend only on (store token, filter), so repeat renders
+    # reuse the built figure instead of re-serializing every polygon
+    @lru_cache(maxsize=8)
+    def create_charging_type_map(scored_token, filter_value):  # ← Already correct!
         """Create map showing tracts colored by charging type"""
-        import plotly.express as px
-        
-        if scored_json is None:
-            return create_initial_map()
+        if scored_token is None:
+            return initial_map
         
         try:
-            scored_gdf = gpd.GeoDataFrame.from_features(json.loads(scored_json)) 
-            
             # Filter by selected type if not 'all'
             if filter_value and filter_value != 'all':
-                display_gdf = scored_gdf[scored_gdf['charging_type'] == filter_value].copy()
+                display_gdf = _store_rows(scored_token, 'charging_type', filter_value,
+                                          _CHARGING_TYPE_MAP_COLS)
             else:
                 # Show ALL feasible sites regardless of classification
-                display_gdf = scored_gdf[scored_gdf['feasible'] == True].copy()
+                display_gdf = _store_rows(scored_token, 'feasible', True, _CHARGING_TYPE_MAP_COLS)
             
             if len(display_gdf) == 0:
                 return create_empty_figure(f"No sites found for type: {filter_value}")
@@ -1524,7 +1558,7 @@ def register_callbacks(app):
             # Create choropleth using type_label for colors
             fig = px.choropleth_mapbox(
                 display_gdf,
-                geojson=display_gdf.geometry.__geo_interface__,
+                geojson=to_display_geojson(display_gdf.geometry),
                 locations=display_gdf.index,
                 color='type_label',  # Use display label for coloring
                 color_discrete_map=color_discrete_map,
@@ -1563,20 +1597,20 @@ def register_callbacks(app):
             
         except Exception as e:
             logger.error(f"Error creating charging type map: {e}", exc_info=True)
-            return create_initial_map()
+            return initial_map
 
 
     @app.callback(
         Output('charging-type-characteristics-table', 'children'),
         Input('scored-data-store', 'data')
     )
-    def create_charging_type_characteristics(scored_json):
+    def create_charging_type_characteristics(scored_token):
         """Create table showing average characteristics by charging type"""
-        if scored_json is None:
+        if scored_token is None:
             return html.P("Run analysis to see characteristics", className="text-muted text-center")
         
         try:
-            scored_gdf = gpd.GeoDataFrame.from_features(json.loads(scored_json))
+            scored_gdf = _store_to_gdf(scored_token)
             feasible = scored_gdf[scored_gdf['feasible'] == True].copy()
             
             # Calculate average metrics by type
@@ -1634,7 +1668,6 @@ def register_callbacks(app):
                 return html.P("No classified sites found", className="text-muted text-center")
             
             # Create DataFrame and table
-            import pandas as pd
             stats_df = pd.DataFrame(type_stats)
             
             return dbc.Table.from_dataframe(
@@ -1664,19 +1697,19 @@ def register_callbacks(app):
         ],
         Input('scored-data-store', 'data')  # ← Keep this
     )
-    def update_urban_rural_metrics(scored_json):  # ← CHANGE parameter name
+    def update_urban_rural_metrics(scored_token):  # ← CHANGE parameter name
         """Display urban/rural distribution statistics"""
-        if scored_json is None:  # ← CHANGE variable name
+        if scored_token is None:  # ← CHANGE variable name
             return "0", "0", "0"
         
         try:
-            # Parse JSON to GeoDataFrame
-            scored_gdf = gpd.GeoDataFrame.from_features(json.loads(scored_json))  # ← PARSE JSON
+            scored_gdf = _store_columns(scored_token, _URBAN_RURAL_COLS)
             feasible = scored_gdf[scored_gdf['feasible'] == True]
             
-            urban_count = (feasible['urban_rural_context'] == 'urban').sum()
-            rural_count = (feasible['urban_rural_context'] == 'rural').sum()
-            mixed_count = (feasible['urban_rural_context'] == 'mixed').sum()
+            context_counts = feasible['urban_rural_context'].value_counts()
+            urban_count = int(context_counts.get('urban', 0))
+            rural_count = int(context_counts.get('rural', 0))
+            mixed_count = int(context_counts.get('mixed', 0))
             
             return str(urban_count), str(rural_count), str(mixed_count)
         except Exception as e:
@@ -1693,30 +1726,23 @@ def register_callbacks(app):
         [Input('scored-data-store', 'data'),  # ← CHANGED from analysis-trigger
          Input('urban-rural-filter', 'value')]
     )
-    def create_urban_rural_map(scored_json, filter_value):  # ← CHANGED parameter name
+    @lru_cache(maxsize=8)
+    def create_urban_rural_map(scored_token, filter_value):  # ← CHANGED parameter name
         """Create map showing tracts colored by urban/rural context"""
-        import plotly.express as px
-        
-        if scored_json is None:
-            return create_initial_map()
+        if scored_token is None:
+            return initial_map
         
         try:
-            # Parse JSON to GeoDataFrame
-            scored_gdf = gpd.GeoDataFrame.from_features(json.loads(scored_json))  # ← ADDED
-            
             # Filter by selected context if not 'all'
             if filter_value and filter_value != 'all':
-                display_gdf = scored_gdf[scored_gdf['urban_rural_context'] == filter_value].copy()
+                display_gdf = _store_rows(scored_token, 'urban_rural_context', filter_value,
+                                          _URBAN_RURAL_MAP_COLS)
             else:
-                display_gdf = scored_gdf[scored_gdf['feasible'] == True].copy()
+                display_gdf = _store_rows(scored_token, 'feasible', True, _URBAN_RURAL_MAP_COLS)
             
             if len(display_gdf) == 0:
                 return create_empty_figure(f"No sites found for context: {filter_value}")
             
-            # Ensure CRS
-            if display_gdf.crs is None:
-                display_gdf.set_crs('EPSG:4326', inplace=True)
-            
             # Define color mapping
             color_discrete_map = {
                 'Urban': '#e74c3c',    # Red
@@ -1740,7 +1766,7 @@ def register_callbacks(app):
             # Create choropleth
             fig = px.choropleth_mapbox(
                 display_gdf,
-                geojson=display_gdf.geometry.__geo_interface__,
+                geojson=to_display_geojson(display_gdf.geometry),
                 locations=display_gdf.index,
                 color='context_label',
                 color_discrete_map=color_discrete_map,
@@ -1779,23 +1805,21 @@ def register_callbacks(app):
             
         except Exception as e:
             logger.error(f"Error creating urban/rural map: {e}", exc_info=True)
-            return create_initial_map()
+            return initial_map
 
 
     @app.callback(
         Output('urban-rural-breakdown-chart', 'figure'),
         Input('scored-data-store', 'data')  # ← CHANGED from analysis-trigger
     )
-    def create_urban_rural_breakdown(scored_json):  # ← CHANGED parameter name
+    def create_urban_rural_breakdown(scored_token):  # ← CHANGED parameter name
         """Create pie chart showing urban/rural distribution"""
-        import plotly.graph_objects as go
-        
-        if scored_json is None:
-            return create_empty_figure("Run analysis first")
+        if scored_token is None:
+            return empty_run_analysis
         
         try:
             # Parse JSON to GeoDataFrame
-            scored_gdf = gpd.GeoDataFrame.from_features(json.loads(scored_json))  # ← ADDED
+            scored_gdf = _store_to_gdf(scored_token)  # ← ADDED
             
             feasible = scored_gdf[scored_gdf['feasible'] == True]
             
@@ -1850,16 +1874,14 @@ def register_callbacks(app):
         Output('context-by-charging-type-chart', 'figure'),
         Input('scored-data-store', 'data')  # ← CHANGED from analysis-trigger
     )
-    def create_context_by_charging_type(scored_json):  # ← CHANGED parameter name
+    def create_context_by_charging_type(scored_token):  # ← CHANGED parameter name
         """Create stacked bar showing charging types by urban/rural context"""
-        import plotly.graph_objects as go
-        
-        if scored_json is None:
-            return create_empty_figure("Run analysis first")
+        if scored_token is None:
+            return empty_run_analysis
         
         try:
             # Parse JSON to GeoDataFrame
-            scored_gdf = gpd.GeoDataFrame.from_features(json.loads(scored_json))  # ← ADDED
+            scored_gdf = _store_to_gdf(scored_token)  # ← ADDED
             
             feasible = scored_gdf[scored_gdf['feasible'] == True]
             
@@ -1910,8 +1932,6 @@ def register_callbacks(app):
     )
     def display_truck_chargers(_):
         """Display list of existing truck charging facilities"""
-        from data_loader import get_truck_chargers
-        
         truck_chargers = get_truck_chargers()
         
         if truck_chargers is None or len(truck_chargers) == 0:
@@ -1969,13 +1989,10 @@ def register_callbacks(app):
     )
     def create_domicile_distribution(trigger):
         """Create chart showing domiciled vehicle distribution"""
-        import plotly.graph_objects as go
-        
         if trigger is None:
-            return create_empty_figure("Run analysis first")
+            return empty_run_analysis
         
         try:
-            from data_loader import get_scored_data
             scored_gdf = get_scored_data()
             
             if scored_gdf is None:
@@ -2034,13 +2051,13 @@ def register_callbacks(app):
         ],
         Input('scored-data-store', 'data')
     )
-    def update_colocation_metrics(scored_json):
+    def update_colocation_metrics(scored_token):
         """Display co-location and expansion opportunity statistics"""
-        if scored_json is None:
+        if scored_token is None:
             return "0", "0", "0", "0"
         
         try:
-            scored_gdf = gpd.GeoDataFrame.from_features(json.loads(scored_json))
+            scored_gdf = _store_to_gdf(scored_token)
             feasible = scored_gdf[scored_gdf['feasible'] == True]
             
             # Co-location metrics
@@ -2069,15 +2086,13 @@ def register_callbacks(app):
         Output('colocation-opportunities-chart', 'figure'),
         Input('scored-data-store', 'data')
     )
-    def create_colocation_chart(scored_json):
+    def create_colocation_chart(scored_token):
         """Create chart showing co-location opportunities"""
-        import plotly.graph_objects as go
-        
-        if scored_json is None:
-            return create_empty_figure("Run analysis first")
+        if scored_token is None:
+            return empty_run_analysis
         
         try:
-            scored_gdf = gpd.GeoDataFrame.from_features(json.loads(scored_json))
+            scored_gdf = _store_to_gdf(scored_token)
             feasible = scored_gdf[scored_gdf['feasible'] == True]
             
             # Get top 30 tracts by co-location score
@@ -2143,28 +2158,23 @@ def register_callbacks(app):
         Output('rest-stop-distribution-map', 'figure'),
         Input('scored-data-store', 'data')
     )
-    def create_rest_stop_map(scored_json):
+    @lru_cache(maxsize=4)
+    def create_rest_stop_map(scored_token):
         """Create map showing rest stop access"""
-        import plotly.express as px
-        
-        if scored_json is None:
-            return create_initial_map()
+        if scored_token is None:
+            return initial_map
         
         try:
-            scored_gdf = gpd.GeoDataFrame.from_features(json.loads(scored_json))
+            scored_gdf = _store_to_gdf(scored_token)
             feasible = scored_gdf[scored_gdf['feasible'] == True].copy()
             
             if len(feasible) == 0:
                 return create_empty_figure("No feasible sites")
             
-            # Ensure CRS
-            if feasible.crs is None:
-                feasible.set_crs('EPSG:4326', inplace=True)
-            
             # Create choropleth colored by rest stop priority score
             fig = px.choropleth_mapbox(
                 feasible,
-                geojson=feasible.geometry.__geo_interface__,
+                geojson=to_display_geojson(feasible.geometry),
                 locations=feasible.index,
                 color='rest_stop_priority_score',
                 color_continuous_scale='YlOrRd',
@@ -2200,22 +2210,20 @@ def register_callbacks(app):
             
         except Exception as e:
             logger.error(f"Error creating rest stop map: {e}", exc_info=True)
-            return create_initial_map()
+            return initial_map
 
 
     @app.callback(
         Output('expansion-potential-scatter', 'figure'),
         Input('scored-data-store', 'data')
     )
-    def create_expansion_scatter(scored_json):
+    def create_expansion_scatter(scored_token):
         """Create scatter showing expansion potential vs demand"""
-        import plotly.graph_objects as go
-        
-        if scored_json is None:
-            return create_empty_figure("Run analysis first")
+        if scored_token is None:
+            return empty_run_analysis
         
         try:
-            scored_gdf = gpd.GeoDataFrame.from_features(json.loads(scored_json))
+            scored_gdf = _store_to_gdf(scored_token)
             feasible = scored_gdf[scored_gdf['feasible'] == True]
             
             if len(feasible) == 0:
@@ -2267,13 +2275,13 @@ def register_callbacks(app):
         Output('colocation-characteristics-table', 'children'),
         Input('selected-sites-store', 'data')
     )
-    def create_colocation_table(optimal_json):
+    def create_colocation_table(optimal_token):
         """Create table showing co-location characteristics for selected sites"""
-        if optimal_json is None:
+        if optimal_token is None:
             return html.P("Run analysis to see selected sites", className="text-muted text-center")
         
         try:
-            optimal_gdf = gpd.GeoDataFrame.from_features(json.loads(optimal_json))
+            optimal_gdf = _store_to_gdf(optimal_token)
             
             if len(optimal_gdf) == 0:
                 return html.P("No sites selected", className="text-muted text-center")
@@ -2282,17 +2290,24 @@ def register_callbacks(app):
             selector = get_selector()
             full_data = selector.gdf[selector.gdf['GEOID'].isin(optimal_gdf['GEOID'])]
             
-            # Create summary table
+            # Create summary table (each column formatted in one pass)
             rows = []
-            for idx, (_, site) in enumerate(full_data.iterrows()):
+            for idx, cells in enumerate(zip(
+                    full_data['GEOID'].str[:10].tolist(),
+                    _format_column(full_data, 'retail_commercial_in_tract', '{:.0f}'),
+                    _format_column(full_data, 'rest_stops_within_5mi', '{:.0f}'),
+                    _format_column(full_data, 'gas_stations_in_tract', '{:.0f}'),
+                    _format_column(full_data, 'hotels_in_tract', '{:.0f}'),
+                    _format_column(full_data, 'estimated_park_ride_area_acres'))):
+                geoid, retail, rest_stops, gas, hotels, expansion = cells
                 rows.append(html.Tr([
                     html.Td(dbc.Badge(f"#{idx+1}", color="dark")),
-                    html.Td(site['GEOID'][:10], className="font-monospace small"),
-                    html.Td(f"{site.get('retail_commercial_in_tract', 0):.0f}"),
-                    html.Td(f"{site.get('rest_stops_within_5mi', 0):.0f}"),
-                    html.Td(f"{site.get('gas_stations_in_tract', 0):.0f}"),
-                    html.Td(f"{site.get('hotels_in_tract', 0):.0f}"),
-                    html.Td(f"{site.get('estimated_park_ride_area_acres', 0):.1f}")
+                    html.Td(geoid, className="font-monospace small"),
+                    html.Td(retail),
+                    html.Td(rest_stops),
+                    html.Td(gas),
+                    html.Td(hotels),
+                    html.Td(expansion)
                 ]))
             
             return dbc.Table([
@@ -2325,13 +2340,13 @@ def register_callbacks(app):
         ],
         Input('scored-data-store', 'data')
     )
-    def update_grid_infrastructure_metrics(scored_json):
+    def update_grid_infrastructure_metrics(scored_token):
         """Display electric grid infrastructure statistics"""
-        if scored_json is None:
+        if scored_token is None:
             return "0", "0", "0", "0"
         
         try:
-            scored_gdf = gpd.GeoDataFrame.from_features(json.loads(scored_json))
+            scored_gdf = _store_to_gdf(scored_token)
             feasible = scored_gdf[scored_gdf['feasible'] == True]
             
             # Grid readiness
@@ -2363,28 +2378,23 @@ def register_callbacks(app):
         Output('grid-readiness-map', 'figure'),
         Input('scored-data-store', 'data')
     )
-    def create_grid_readiness_map(scored_json):
+    @lru_cache(maxsize=4)
+    def create_grid_readiness_map(scored_token):
         """Create map showing EV infrastructure readiness"""
-        import plotly.express as px
-        
-        if scored_json is None:
-            return create_initial_map()
+        if scored_token is None:
+            return initial_map
         
         try:
-            scored_gdf = gpd.GeoDataFrame.from_features(json.loads(scored_json))
+            scored_gdf = _store_to_gdf(scored_token)
             feasible = scored_gdf[scored_gdf['feasible'] == True].copy()
             
             if len(feasible) == 0:
                 return create_empty_figure("No feasible sites")
             
-            # Ensure CRS
-            if feasible.crs is None:
-                feasible.set_crs('EPSG:4326', inplace=True)
-            
             # Create choropleth
             fig = px.choropleth_mapbox(
                 feasible,
-                geojson=feasible.geometry.__geo_interface__,
+                geojson=to_display_geojson(feasible.geometry),
                 locations=feasible.index,
                 color='ev_infrastructure_readiness',
                 color_continuous_scale='RdYlGn',
@@ -2454,22 +2464,20 @@ def register_callbacks(app):
             
         except Exception as e:
             logger.error(f"Error creating grid readiness map: {e}", exc_info=True)
-            return create_initial_map()
+            return initial_map
 
 
     @app.callback(
         Output('solar-potential-chart', 'figure'),
         Input('scored-data-store', 'data')
     )
-    def create_solar_potential_chart(scored_json):
+    def create_solar_potential_chart(scored_token):
         """Create chart showing solar potential breakdown"""
-        import plotly.graph_objects as go
-        
-        if scored_json is None:
-            return create_empty_figure("Run analysis first")
+        if scored_token is None:
+            return empty_run_analysis
         
         try:
-            scored_gdf = gpd.GeoDataFrame.from_features(json.loads(scored_json))
+            scored_gdf = _store_to_gdf(scored_token)
             feasible = scored_gdf[scored_gdf['feasible'] == True]
             
             # Get top 30 tracts by total solar capacity
@@ -2529,15 +2537,13 @@ def register_callbacks(app):
         Output('grid-suitability-scatter', 'figure'),
         Input('scored-data-store', 'data')
     )
-    def create_grid_suitability_scatter(scored_json):
+    def create_grid_suitability_scatter(scored_token):
         """Create scatter showing grid suitability vs demand"""
-        import plotly.graph_objects as go
-        
-        if scored_json is None:
-            return create_empty_figure("Run analysis first")
+        if scored_token is None:
+            return empty_run_analysis
         
         try:
-            scored_gdf = gpd.GeoDataFrame.from_features(json.loads(scored_json))
+            scored_gdf = _store_to_gdf(scored_token)
             feasible = scored_gdf[scored_gdf['feasible'] == True]
             
             if len(feasible) == 0:
@@ -2604,13 +2610,13 @@ def register_callbacks(app):
         Output('grid-infrastructure-table', 'children'),
         Input('selected-sites-store', 'data')
     )
-    def create_grid_infrastructure_table(optimal_json):
+    def create_grid_infrastructure_table(optimal_token):
         """Create table showing grid infrastructure for selected sites"""
-        if optimal_json is None:
+        if optimal_token is None:
             return html.P("Run analysis to see selected sites", className="text-muted text-center")
         
         try:
-            optimal_gdf = gpd.GeoDataFrame.from_features(json.loads(optimal_json))
+            optimal_gdf = _store_to_gdf(optimal_token)
             
             if len(optimal_gdf) == 0:
                 return html.P("No sites selected", className="text-muted text-center")
@@ -2619,10 +2625,23 @@ def register_callbacks(app):
             selector = get_selector()
             full_data = selector.gdf[selector.gdf['GEOID'].isin(optimal_gdf['GEOID'])]
             
+            if 'ev_infrastructure_readiness' in full_data.columns:
+                readiness_values = full_data['ev_infrastructure_readiness'].tolist()
+            else:
+                readiness_values = [0] * len(full_data)
+
             rows = []
-            for idx, (_, site) in enumerate(full_data.iterrows()):
-                readiness = site.get('ev_infrastructure_readiness', 0)
-                
+            for idx, cells in enumerate(zip(
+                    full_data['GEOID'].str[:10].tolist(),
+                    readiness_values,
+                    _format_column(full_data, 'ev_infrastructure_readiness'),
+                    _format_column(full_data, 'electric_grid_suitability', '{:.2f}/5'),
+                    _format_column(full_data, 'electric_pct_high_grade', '{:.1f}%'),
+                    _format_column(full_data, 'solar_total_capacity_kw', '{:.0f}'),
+                    _format_column(full_data, 'solar_building_capacity_kw', '{:.0f}'),
+                    _format_column(full_data, 'solar_carport_capacity_kw', '{:.0f}'))):
+                geoid, readiness, readiness_label, grid_suit, high_grade, solar, building, carport = cells
+
                 # Color code readiness
                 if readiness >= 70:
                     badge_color = "success"
@@ -2630,16 +2649,16 @@ def register_callbacks(app):
                     badge_color = "warning"
                 else:
                     badge_color = "danger"
-                
+
                 rows.append(html.Tr([
                     html.Td(dbc.Badge(f"#{idx+1}", color="dark")),
-                    html.Td(site['GEOID'][:10], className="font-monospace small"),
-                    html.Td(dbc.Badge(f"{readiness:.1f}", color=badge_color)),
-                    html.Td(f"{site.get('electric_grid_suitability', 0):.2f}/5"),
-                    html.Td(f"{site.get('electric_pct_high_grade', 0):.1f}%"),
-                    html.Td(f"{site.get('solar_total_capacity_kw', 0):.0f}"),
-                    html.Td(f"{site.get('solar_building_capacity_kw', 0):.0f}"),
-                    html.Td(f"{site.get('solar_carport_capacity_kw', 0):.0f}")
+                    html.Td(geoid, className="font-monospace small"),
+                    html.Td(dbc.Badge(readiness_label, color=badge_color)),
+                    html.Td(grid_suit),
+                    html.Td(high_grade),
+                    html.Td(solar),
+                    html.Td(building),
+                    html.Td(carport)
                 ]))
             
             return dbc.Table([
@@ -2660,90 +2679,89 @@ def register_callbacks(app):
             logger.error(f"Error creating grid infrastructure table: {e}", exc_info=True)
             return html.P(f"Error: {str(e)}", className="text-danger")
 
-    @app.callback(
-        Output('download-export', 'data'),
-        Input('export-btn', 'n_clicks'),
-        State('selected-sites-store', 'data'),
-        prevent_initial_call=True
-    )
-    def export_optimal_sites(n_clicks, selected_sites_json):
-        """Export the currently selected optimal sites (tract-level).
+    def _missing_mask(a):
+        """Boolean mask of missing or blank ('') entries in a column array."""
+        missing = pd.isna(a)
+        if a.dtype == object:
+            present = ~missing
+            missing[present] = a[present] == ''
+        return missing
+
+    def _prefer_left(left, right):
+        """Values of `left`, taking `right` wherever left is missing or blank ('')."""
+        a = left.to_numpy()
+        missing = _missing_mask(a)
+        if not missing.any():
+            return left
+        return pd.Series(np.where(missing, right.to_numpy(), a), index=left.index, name=left.name)
+
+    # Stored results are immutable per token, so the CSV only changes when the
+    # token or selector.gdf does; repeat downloads are served from this cache
+    @lru_cache(maxsize=32)
+    def _export_csv_bytes(selected_sites_token, gdf_version):
+        """Build the optimal-sites export CSV (UTF-8 bytes) for a stored result.
 
         Notes
         - We keep score fields from the selected-sites store (those are computed at runtime).
         - We back-fill raw/source columns from selector.gdf (e.g., total_pop) because the
-          stored FeatureCollection properties can be trimmed/incomplete.
+          stored result columns can be trimmed/incomplete.
         - Export is CSV to avoid needing Excel writer engines on Render.
         """
-        if not selected_sites_json:
-            raise PreventUpdate
-
-        import json
-        import pandas as pd
-
-        data = json.loads(selected_sites_json) if isinstance(selected_sites_json, str) else selected_sites_json
-        features = data.get('features', []) or []
-        if not features:
+        optimal_gdf = _store_to_gdf(selected_sites_token)
+        if len(optimal_gdf) == 0:
             raise PreventUpdate
 
-        # 1) Start from FeatureCollection properties so computed scores remain available
-        props_rows = [f.get('properties', {}) or {} for f in features]
-        df_props = pd.DataFrame(props_rows)
+        # 1) Start from the stored result attributes so computed scores remain available;
+        #    only columns the export can use are carried along
+        df = pd.DataFrame(optimal_gdf[[c for c in optimal_gdf.columns if c in _EXPORT_KEEP_COLS]])
 
-        if 'GEOID' not in df_props.columns:
+        if 'GEOID' not in df.columns:
             raise PreventUpdate
 
-        df_props['GEOID'] = df_props['GEOID'].astype(str)
+        df['GEOID'] = df['GEOID'].astype(str)
 
         # 2) Pull raw/source fields from the full selector dataframe to back-fill missing values
         selector = get_selector()
         if selector is None or not hasattr(selector, 'gdf'):
             raise PreventUpdate
 
-        geoid_list = df_props['GEOID'].dropna().astype(str).unique().tolist()
-
-        desired_raw_cols = [
-            'GEOID',
-            'total_pop',
-            # 'Heavy_Duty', 'Light_Duty', 'Medium_Duty',
-            # 'avg_stop_duration_minutes',
-            # 'Heavy_Duty__AM_Peak_6_10',
-            # 'Heavy_Duty__Evening_19_6',
-            # 'Heavy_Duty__Midday_10_15',
-            # 'Heavy_Duty__PM_Peak_15_19',
-            'equity_0_trips', 'equity_1_trips', 'dow_1_trips', 'dow_2_3_trips', '%_long_distance_trips','rural_flag',
-            # 'government_social_services_within_5mi','grocery_stores_within_5mi','park_ride_spaces_within_5mi',
-            'poi_density_per_sq_mi',
-            'pct_ej_block_groups',
-            'rest_stop_density',
-            # 'substations_per_sq_mi',
-            # 'total_vehicles_domiciled',
-            'charging_type','median_feeder_headroom_mva'
-        ]
-        raw_cols_present = [c for c in desired_raw_cols if c in selector.gdf.columns]
-        raw_df = selector.gdf[selector.gdf['GEOID'].astype(str).isin(geoid_list)][raw_cols_present].copy()
-        if 'GEOID' in raw_df.columns:
-            raw_df['GEOID'] = raw_df['GEOID'].astype(str)
-
-        df = df_props.merge(raw_df, on='GEOID', how='left', suffixes=('', '_raw'))
-
         # Backward compatibility: older stores may still use truck_charger_gap_score
         if 'truck_charger_gap_score' in df.columns and 'charger_gap_score' not in df.columns:
             df.rename(columns={'truck_charger_gap_score': 'charger_gap_score'}, inplace=True)
 
-
-        # 3) Prefer values already in df_props; fill missing/blank from raw
-        for c in desired_raw_cols:
-            if c == 'GEOID':
-                continue
-            c_raw = f"{c}_raw"
-            if c in df.columns and c_raw in df.columns:
-                # treat blank strings as missing
-                df[c] = df[c].replace('', pd.NA)
-                df[c] = df[c].where(df[c].notna(), df[c_raw])
-                df.drop(columns=[c_raw], inplace=True)
-            elif c not in df.columns and c_raw in df.columns:
-                df.rename(columns={c_raw: c}, inplace=True)
+        # Only fetch raw columns that add something: ones the stored result lacks
+        # and ones with missing/blank values (usually none, so no lookup at all)
+        gdf_columns = selector.gdf.columns
+        needed_cols = [c for c in _RAW_EXPORT_COLS
+                       if c != 'GEOID' and c in gdf_columns
+                       and (c not in df.columns or _missing_mask(df[c].to_numpy()).any())]
+
+        if needed_cols:
+            geoid_list = df['GEOID'].dropna().unique().tolist()
+            # rows_for_geoids gathers into a new frame already; no extra copy needed
+            raw_df = selector.rows_for_geoids(geoid_list, ['GEOID'] + needed_cols)
+
+            # Hash lookup of each export row's raw values by GEOID (one reindex for
+            # all columns) instead of a wide merge with _raw suffixes
+            raw_lookup = (raw_df.drop_duplicates('GEOID')
+                          .set_index('GEOID')
+                          .reindex(df['GEOID'])
+                          .set_axis(df.index, axis=0))
+
+            # 3) Prefer values already in the stored result; fill missing/blank from raw
+            fill_cols = [c for c in needed_cols if c in df.columns]
+            raw_only_cols = [c for c in needed_cols if c not in df.columns]
+            # float64 columns on both sides are filled together in one 2D pass
+            float_cols = [c for c in fill_cols
+                          if df[c].dtype == np.float64 and raw_lookup[c].dtype == np.float64]
+            if float_cols:
+                left = df[float_cols].to_numpy()
+                df[float_cols] = np.where(np.isnan(left), raw_lookup[float_cols].to_numpy(), left)
+            for c in fill_cols:
+                if c not in float_cols:
+                    df[c] = _prefer_left(df[c], raw_lookup[c])
+            if raw_only_cols:
+                df[raw_only_cols] = raw_lookup[raw_only_cols]
 
         # # 4) Bin domicile values for export (privacy-friendly)
         # domicile_bins = [0, 25, 50, 100, 200, 500, float('inf')]
@@ -2759,14 +2777,45 @@ def register_callbacks(app):
 
         # 5) Rank: sort by composite_score desc when available
         if 'composite_score' in df.columns:
-            df['composite_score'] = pd.to_numeric(df['composite_score'], errors='coerce')
-            df = df.sort_values('composite_score', ascending=False, na_position='last')
-
-        df.insert(0, 'rank', range(1, len(df) + 1))
+            # composite_score is numeric already (coerced in store_analysis_result).
+            # One argsort on the score array, then a single take (NaN scores last)
+            scores = df['composite_score'].to_numpy(dtype=float, na_value=np.nan)
+            order = np.argsort(-np.nan_to_num(scores, nan=-np.inf), kind='stable')
+            df = df.take(order)
+
+        df.insert(0, 'rank', np.arange(1, len(df) + 1, dtype=np.int32))
+
+        # Missing export columns come back all-NaN (written as blanks)
+        out = df.reindex(columns=_EXPORT_COLS)
+
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator='\n')
+        writer.writerow(_EXPORT_HEADER)
+        # Only one block of rows is converted to Python objects at a time
+        chunk_rows = 10000
+        for start in range(0, len(out), chunk_rows):
+            block = out.iloc[start:start + chunk_rows]
+            # Blank out missing values for the whole block at once, then hand
+            # csv's C writer plain row lists (no per-cell Python checks)
+            writer.writerows(
+                block.astype(object).where(block.notna(), '').to_numpy().tolist()
+            )
+        return buf.getvalue().encode('utf-8')
 
-        # Output schema requested (ordered)
-        export_cols = ['rank', 'GEOID', 'charging_type', 'composite_score', 'demand_score', 'infrastructure_score', 'accessibility_score', 'equity_feasibility_score', 'home_end_score', 'workplace_end_score', 'other_end_score', 'weekday_trip_score', 'weekend_trip_score', 'equity_community_trip_score', 'non_equity_community_trip_score', 'demand_stability_score', 'peak_intensity_score', 'charger_gap_score', 'park_ride_colocation_score', 'government_colocation_score', 'network_density_score', 'grocery_colocation_score', 'gas_station_colocation_score', 'ej_access_score', 'landuse_suitability_score', 'commercial_industrial_score', 'protected_land_penalty_score', '%_long_distance_trips', 'rural_flag', 'total_pop', 'median_feeder_headroom_mva']
+    @app.callback(
+        Output('download-export', 'data'),
+        Input('export-btn', 'n_clicks'),
+        State('selected-sites-store', 'data'),
+        prevent_initial_call=True
+    )
+    def export_optimal_sites(n_clicks, selected_sites_token):
+        """Export the currently selected optimal sites (tract-level) as CSV."""
+        if not selected_sites_token:
+            raise PreventUpdate
 
-        out = pd.DataFrame({c: df[c] if c in df.columns else pd.NA for c in export_cols})
+        selector = get_selector()
+        if selector is None or not hasattr(selector, 'gdf'):
+            raise PreventUpdate
 
-        return dcc.send_data_frame(out.to_csv, 'optimal_sites_export.csv', index=False)
\ No newline at end of file
+        csv_bytes = _export_csv_bytes(selected_sites_token, selector.gdf_version)
+        return dcc.send_bytes(csv_bytes, 'optimal_sites_export.csv')
\ No newline at end of file
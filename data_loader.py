@@ -4,8 +4,15 @@ Precomputes scores on first load to improve dashboard performance.
 """
 
 import logging
+import os
+import re
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
 import geopandas as gpd
-from selector import TruckChargingSiteSelector
+import numpy as np
+from selector import TruckChargingSiteSelector, downcast_int_columns, read_geodata
 import pandas as pd
 logger = logging.getLogger(__name__)
 
@@ -33,6 +40,153 @@ def get_optimal_sites():
     return _optimal_sites_cache
 
 
+# ============================================================================
+# ANALYSIS RESULT STORE
+# ============================================================================
+# run_analysis results are kept server-side and the browser's dcc.Store only
+# holds a token. Results are pickled to a shared directory so any gunicorn
+# worker can resolve a token, with a small in-process LRU in front.
+_RESULTS_DIR = os.environ.get(
+    "RESULTS_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "secondary-dash-results")
+)
+_RESULTS_MAX_FILES = 64
+_RESULTS_MEMORY_SIZE = 8
+_TOKEN_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+_results_memory = OrderedDict()
+_results_centroids = OrderedDict()
+_results_lock = threading.Lock()
+
+
+def _remember_result(token, gdf):
+    """Put a result in the in-process LRU"""
+    with _results_lock:
+        _results_memory[token] = gdf
+        _results_memory.move_to_end(token)
+        while len(_results_memory) > _RESULTS_MEMORY_SIZE:
+            _results_memory.popitem(last=False)
+
+
+def _prune_result_files():
+    """Keep only the most recent result files on disk"""
+    try:
+        paths = [os.path.join(_RESULTS_DIR, name) for name in os.listdir(_RESULTS_DIR)
+                 if name.endswith(".pkl")]
+        paths.sort(key=os.path.getmtime, reverse=True)
+        for path in paths[_RESULTS_MAX_FILES:]:
+            os.remove(path)
+    except OSError as e:
+        logger.warning(f"Could not prune analysis result cache: {e}")
+
+
+def store_analysis_result(gdf) -> str:
+    """
+    Store an analysis result GeoDataFrame server-side.
+
+    Returns:
+        Token to put in a dcc.Store; resolve it with load_analysis_result()
+    """
+    token = uuid.uuid4().hex
+    if not isinstance(gdf, gpd.GeoDataFrame):
+        # selector.scores is a plain DataFrame carrying a geometry column
+        gdf = gpd.GeoDataFrame(gdf, geometry='geometry', crs='EPSG:4326')
+    gdf = gdf.reset_index(drop=True)
+    if gdf.crs is None:
+        # Set once here so callbacks never have to default the CRS
+        gdf = gdf.set_crs('EPSG:4326')
+    if 'composite_score' in gdf.columns and not pd.api.types.is_numeric_dtype(gdf['composite_score']):
+        # Coerced once here so consumers (ranking, export) can rely on a numeric score
+        gdf['composite_score'] = pd.to_numeric(gdf['composite_score'], errors='coerce')
+    # Scores carry many int64 columns (mostly filler zeros for absent subfactors);
+    # narrower ints shrink the pickles and every load of them
+    downcast_int_columns(gdf)
+
+    os.makedirs(_RESULTS_DIR, exist_ok=True)
+    path = os.path.join(_RESULTS_DIR, f"{token}.pkl")
+    tmp_path = f"{path}.tmp"
+    gdf.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+
+    _remember_result(token, gdf)
+    _prune_result_files()
+    return token
+
+
+def load_analysis_result(token):
+    """
+    Resolve a store token to its GeoDataFrame.
+
+    Returns:
+        The stored GeoDataFrame (shared; copy before mutating), or None if the
+        token is unknown or has expired
+    """
+    if not isinstance(token, str) or not _TOKEN_PATTERN.fullmatch(token):
+        return None
+
+    with _results_lock:
+        gdf = _results_memory.get(token)
+        if gdf is not None:
+            _results_memory.move_to_end(token)
+            return gdf
+
+    path = os.path.join(_RESULTS_DIR, f"{token}.pkl")
+    try:
+        gdf = pd.read_pickle(path)
+    except FileNotFoundError:
+        return None
+
+    _remember_result(token, gdf)
+    return gdf
+
+
+
+def _build_result_centroids(gdf):
+    """Tract centroids for a result as a GEOID -> row index map plus float32 lat/lon arrays"""
+    geoms = gdf.geometry
+    if gdf.crs is None:
+        points = geoms.centroid
+    else:
+        # Centroid in a metric CRS, then back to lon/lat for the map
+        points = geoms.to_crs('EPSG:3857').centroid.to_crs('EPSG:4326')
+    geoids = gdf['GEOID']
+    if not pd.api.types.is_string_dtype(geoids):
+        geoids = geoids.astype(str)
+    positions = {geoid: i for i, geoid in enumerate(geoids.tolist())}
+    return positions, points.y.to_numpy(dtype=np.float32), points.x.to_numpy(dtype=np.float32)
+
+
+def get_result_centroid(token, geoid):
+    """
+    Map centre (lat, lon) of a tract in an analysis result.
+
+    The centroid arrays are computed once per token and kept next to the
+    in-process result cache, so repeat lookups are a dict hit plus indexing.
+
+    Returns:
+        (lat, lon) tuple, or None if the token or GEOID is unknown
+    """
+    with _results_lock:
+        centroids = _results_centroids.get(token)
+        if centroids is not None:
+            _results_centroids.move_to_end(token)
+
+    if centroids is None:
+        gdf = load_analysis_result(token)
+        if gdf is None or len(gdf) == 0 or 'GEOID' not in gdf.columns:
+            return None
+        centroids = _build_result_centroids(gdf)
+        with _results_lock:
+            _results_centroids[token] = centroids
+            while len(_results_centroids) > _RESULTS_MEMORY_SIZE:
+                _results_centroids.popitem(last=False)
+
+    positions, lats, lons = centroids
+    i = positions.get(str(geoid))
+    if i is None:
+        return None
+    return float(lats[i]), float(lons[i])
+
 def get_selector(geojson_path: str = "data/my_data.geojson") -> TruckChargingSiteSelector:
     """
     Returns a cached instance of TruckChargingSiteSelector.
@@ -127,7 +281,7 @@ def get_truck_chargers(shp_path: str = "data/Electric_Vehicle_Charging_Stations.
             logger.info("Loading truck charger locations...")
             
             # Read CSV
-            gdf = gpd.read_file(shp_path)
+            gdf = read_geodata(shp_path)
             
             # # Create GeoDataFrame from lat/lon
             # gdf = gpd.GeoDataFrame(
@@ -1,7 +1,7 @@
 """
 Database configuration and session management
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 from contextlib import contextmanager
 import os
@@ -9,12 +9,32 @@ import os
 # Use environment variable for database URL in production
 DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///users.db")
 
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+
+# Dash fires several concurrent requests per interaction, so allow more pooled
+# connections than SQLAlchemy's default of 5 + 10 overflow.
 engine = create_engine(
     DATABASE_URL,
     echo=False,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
+    pool_size=20,
+    max_overflow=40,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    connect_args={"check_same_thread": False} if IS_SQLITE else {}
 )
 
+
+if IS_SQLITE:
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Use WAL mode so readers don't block on writers"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -4,6 +4,7 @@ GeoJSON file loader with error handling and optimization
 import requests
 import json
 import logging
+import orjson
 from typing import Dict, Any
 
 logger = logging.getLogger(__name__)
@@ -38,7 +39,8 @@ def load_geojson(url: str, timeout: int = 120) -> Dict[str, Any]:
         
         # Load JSON
         logger.info("Parsing GeoJSON...")
-        data = response.json()
+        # orjson parses the raw body in C (its JSONDecodeError subclasses json's)
+        data = orjson.loads(response.content)
         
         # Validate structure
         if not isinstance(data, dict):
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from dash import html, dcc
 import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
@@ -265,12 +266,12 @@ def create_demand_subweights_section() -> html.Div:
                 dbc.Button([
                     html.I(className="fas fa-undo me-1"),
                     "Reset Demand Defaults"
-                ], id="reset-demand-subweights-btn",
+                ], id={'type': 'reset-subweights', 'cat': 'demand'},
                    color="secondary", size="sm", outline=True,
                    className="w-100 mt-2")
             ], className="p-2")
         ], className="border-start border-primary border-3")
-    ], id="demand-subweights-collapse", is_open=False)
+    ], id={'type': 'subweight-collapse', 'cat': 'demand'}, is_open=False)
 
 
 
@@ -300,12 +301,12 @@ def create_infrastructure_subweights_section() -> html.Div:
                 dbc.Button([
                     html.I(className="fas fa-undo me-1"),
                     "Reset Infrastructure Defaults"
-                ], id="reset-infrastructure-subweights-btn",
+                ], id={'type': 'reset-subweights', 'cat': 'infrastructure'},
                    color="secondary", size="sm", outline=True,
                    className="w-100 mt-2")
             ], className="p-2")
         ], className="border-start border-success border-3")
-    ], id="infrastructure-subweights-collapse", is_open=False)
+    ], id={'type': 'subweight-collapse', 'cat': 'infrastructure'}, is_open=False)
 
 
 def create_accessibility_subweights_section() -> html.Div:
@@ -326,12 +327,12 @@ def create_accessibility_subweights_section() -> html.Div:
                 dbc.Button([
                     html.I(className="fas fa-undo me-1"),
                     "Reset Accessibility Defaults"
-                ], id="reset-accessibility-subweights-btn",
+                ], id={'type': 'reset-subweights', 'cat': 'accessibility'},
                    color="secondary", size="sm", outline=True,
                    className="w-100 mt-2")
             ], className="p-2")
         ], className="border-start border-danger border-3")
-    ], id="accessibility-subweights-collapse", is_open=False)
+    ], id={'type': 'subweight-collapse', 'cat': 'accessibility'}, is_open=False)
 
 
 def create_equity_subweights_section() -> html.Div:
@@ -360,12 +361,12 @@ def create_equity_subweights_section() -> html.Div:
                 dbc.Button([
                     html.I(className="fas fa-undo me-1"),
                     "Reset Equity Defaults"
-                ], id="reset-equity-subweights-btn", 
+                ], id={'type': 'reset-subweights', 'cat': 'equity'}, 
                    color="secondary", size="sm", outline=True, 
                    className="w-100 mt-2")
             ], className="p-2")
         ], className="border-start border-info border-3")
-    ], id="equity-subweights-collapse", is_open=False)
+    ], id={'type': 'subweight-collapse', 'cat': 'equity'}, is_open=False)
 
 
 def create_weight_slider_with_expand(id_suffix: str, label: str, 
@@ -387,7 +388,7 @@ def create_weight_slider_with_expand(id_suffix: str, label: str,
         dbc.Col([
             dbc.Button(
                 html.I(className="fas fa-chevron-down"),
-                id=f'{id_suffix}-expand-btn',
+                id={'type': 'subweight-expand-btn', 'cat': id_suffix},
                 color="link",
                 size="sm",
                 className="p-0"
@@ -416,8 +417,9 @@ def create_weight_slider_with_expand(id_suffix: str, label: str,
 # MAIN LAYOUT FUNCTION
 # ============================================================================
 
+@lru_cache(maxsize=1)
 def create_layout():
-    """Create the complete dashboard layout"""
+    """Create the complete dashboard layout (built once per process)"""
     return html.Div([
         create_navbar(),
 
@@ -1420,7 +1422,7 @@ def create_layout():
         dcc.Store(id='scored-data-store'),
         dcc.Store(id='selected-sites-store'),
         dcc.Store(id='config-store'),
-        dcc.Store(id='clicked-geoid-store'),
+        dcc.Store(id='tract-centroid-store'),
         dcc.Download(id='download-export')
 
     ], style={"backgroundColor": "#f8f9fa", "minHeight": "100vh"})
\ No newline at end of file
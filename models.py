@@ -4,7 +4,13 @@ Database models
 from db import Base
 from sqlalchemy import Column, Integer, String, DateTime
 from sqlalchemy.sql import func
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
+
+# argon2id with OWASP's minimum recommended parameters; much cheaper per login
+# than werkzeug's 600k-round pbkdf2 while remaining memory-hard.
+_password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
 
 
 class User(Base):
@@ -17,11 +23,28 @@ class User(Base):
 
     def set_password(self, password):
         """Hash and set user password"""
-        self.password_hash = generate_password_hash(password, method='pbkdf2:sha256')
+        self.password_hash = _password_hasher.hash(password)
 
     def check_password(self, password):
-        """Verify password against hash"""
-        return check_password_hash(self.password_hash, password)
+        """
+        Verify password against hash.
+        Legacy pbkdf2 hashes and argon2 hashes with outdated parameters are
+        upgraded in place on a successful check (saved when the session commits).
+        """
+        if not self.password_hash.startswith('$argon2'):
+            if not check_password_hash(self.password_hash, password):
+                return False
+            self.set_password(password)
+            return True
+
+        try:
+            _password_hasher.verify(self.password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+        if _password_hasher.check_needs_rehash(self.password_hash):
+            self.set_password(password)
+        return True
 
     def __repr__(self):
         return f"<User {self.username}>"
\ No newline at end of file
@@ -1,6 +1,42 @@
 import geopandas as gpd
 import pandas as pd
 import numpy as np
+import shapely
+
+# Prefer the pyogrio engine (with Arrow transfer when pyarrow is available)
+# for vector file reads; fall back to geopandas' default engine otherwise.
+try:
+    import pyogrio  # noqa: F401
+    _READ_FILE_KWARGS = {'engine': 'pyogrio'}
+    try:
+        import pyarrow  # noqa: F401
+        _READ_FILE_KWARGS['use_arrow'] = True
+    except ImportError:
+        pass
+except ImportError:
+    _READ_FILE_KWARGS = {}
+
+
+def read_geodata(path, **kwargs):
+    """Read a vector data file with the fastest available I/O engine."""
+    return gpd.read_file(path, **_READ_FILE_KWARGS, **kwargs)
+
+
+def downcast_int_columns(df):
+    """
+    Convert int64 columns whose values fit in 32 bits to int32, in place.
+
+    Halves their memory; floats stay float64 so scores and exports keep full
+    precision.
+    """
+    int_cols = df.select_dtypes(include='int64').columns
+    if len(int_cols):
+        int32 = np.iinfo(np.int32)
+        fits = (df[int_cols].min() >= int32.min) & (df[int_cols].max() <= int32.max)
+        narrow = int_cols[fits.to_numpy()]
+        df[narrow] = df[narrow].astype(np.int32)
+    return df
+
 
 class TruckChargingSiteSelector:
     """
@@ -8,11 +44,43 @@ class TruckChargingSiteSelector:
     Updated for Massachusetts data structure with LOCUS, land use, traffic data, and TEMPORAL DEMAND.
     """
 
+    # Per component score: the config sections it reads and the gdf columns it
+    # writes. Used to reuse a component's result when only other sections changed.
+    _SCORE_COMPONENTS = {
+        'demand': (
+            ('demand_weights', 'demand_component_weights'),
+            ('home_end_score', 'workplace_end_score', 'other_end_score',
+             'weekday_trip_score', 'weekend_trip_score',
+             'equity_community_trip_score', 'non_equity_community_trip_score',
+             'demand_stability_score', 'peak_intensity_score',
+             'purpose_component_score', 'day_of_week_component_score',
+             'equity_trips_component_score', 'temporal_component_score'),
+        ),
+        'infrastructure': (
+            ('infrastructure_weights',),
+            # Also resets the accessibility columns before they are rescored
+            ('network_density_score', 'grocery_colocation_score', 'gas_station_colocation_score',
+             'charger_gap_score', 'park_ride_colocation_score', 'government_colocation_score'),
+        ),
+        'accessibility': (
+            ('accessibility_weights', 'secondary_corridor_mode'),
+            ('network_density_score', 'grocery_colocation_score', 'gas_station_colocation_score'),
+        ),
+        'equity_feasibility': (
+            ('equity_weights',),
+            ('ej_access_score', 'landuse_suitability_score',
+             'commercial_industrial_score', 'protected_land_penalty_score'),
+        ),
+    }
+
     def __init__(self, geojson_path, config=None):
         """
         Initialize the selector with tract-level GeoJSON data.
         """
-        self.gdf = gpd.read_file(geojson_path)
+        self.gdf_version = 0
+        self._geoid_index = None
+        self._score_memo = {}
+        self.gdf = read_geodata(geojson_path)
         
         # Convert to WGS84 if not already (required for web mapping)
         if self.gdf.crs is not None and self.gdf.crs != 'EPSG:4326':
@@ -26,10 +94,31 @@ class TruckChargingSiteSelector:
         self.scores = None
         
         self._verify_data_structure()
+
+        # GEOIDs are keys everywhere downstream; make them strings once here
+        self.gdf['GEOID'] = self.gdf['GEOID'].astype(str)
+
+        # Canonical identifier-style name for the long-distance share column
+        if '%_long_distance_trips' in self.gdf.columns and 'pct_long_distance_trips' not in self.gdf.columns:
+            self.gdf.rename(columns={'%_long_distance_trips': 'pct_long_distance_trips'}, inplace=True)
+
+        # Integer columns that fit in 32 bits are kept as int32
+        downcast_int_columns(self.gdf)
         
         self._calculate_truck_charger_proximity()
         
 
+    @property
+    def gdf(self):
+        return self._gdf
+
+    @gdf.setter
+    def gdf(self, value):
+        # Reassigning the frame invalidates anything derived from it
+        self._gdf = value
+        self._geoid_index = None
+        self.gdf_version += 1
+
     def _verify_data_structure(self):
         """Verify that required columns exist in the data"""
         required_base = ['GEOID', 'geometry']
@@ -834,6 +923,26 @@ class TruckChargingSiteSelector:
             print("\n   Warning: Secondary corridor data not available, no filter applied")
             return pd.Series(True, index=df.index)
 
+    def _component_score(self, name, compute):
+        """
+        Run one component scorer, or reuse its last result when neither the
+        data nor the config sections it reads have changed since then.
+        """
+        config_keys, columns = self._SCORE_COMPONENTS[name]
+        key = (self.gdf_version, repr([self.config.get(k) for k in config_keys]))
+        memo = self._score_memo.get(name)
+        if memo is not None and memo[0] == key:
+            print(f"   {name} inputs unchanged → reusing previous score")
+            # Replay the subfactor columns the scorer would have written
+            for col, values in memo[2].items():
+                self.gdf[col] = values
+            return memo[1]
+
+        score = compute()
+        written = {col: self.gdf[col].to_numpy(copy=True) for col in columns if col in self.gdf.columns}
+        self._score_memo[name] = (key, score, written)
+        return score
+
     def calculate_composite_score(self):
         """
         Calculate weighted composite score for all tracts.
@@ -846,13 +955,13 @@ class TruckChargingSiteSelector:
 
         # Calculate individual component scores
         print("\n1. Calculating demand score...")
-        demand = self.calculate_demand_score()
+        demand = self._component_score('demand', self.calculate_demand_score)
         
         print("\n2. Calculating infrastructure score...")
-        infrastructure = self.calculate_infrastructure_score()
+        infrastructure = self._component_score('infrastructure', self.calculate_infrastructure_score)
         
         print("\n3. Calculating accessibility score...")
-        accessibility = self.calculate_accessibility_score()
+        accessibility = self._component_score('accessibility', self.calculate_accessibility_score)
         
         # NEW: Classify charging types BEFORE equity scoring
         print("\n4. Classifying urban/rural context...")
@@ -863,7 +972,8 @@ class TruckChargingSiteSelector:
         
         # NOW calculate equity with charging-type-aware EJ scoring
         print("\n6. Calculating equity & feasibility score (charging-type aware)...")
-        equity_feasibility = self.calculate_equity_feasibility_score()
+        equity_feasibility = self._component_score(
+            'equity_feasibility', self.calculate_equity_feasibility_score)
 
         passes_minimum = self.apply_minimal_constraints()
 
@@ -1061,23 +1171,18 @@ class TruckChargingSiteSelector:
         print(f"\nSelecting {n_sites} optimal sites from {len(feasible_scores)} feasible candidates...")
         print(f"Minimum separation: {min_distance_mi} miles")
 
+        # Greedy pick on precomputed centroid arrays (degrees; ~69 mi per degree)
+        centroids = shapely.centroid(feasible_scores['geometry'].to_numpy())
+        positions = self._greedy_select_positions(
+            shapely.get_x(centroids), shapely.get_y(centroids),
+            n_sites, min_distance_mi
+        )
+        selected = feasible_scores.iloc[positions]
+
         selected_sites = []
-        selected_geoms = []
         charging_types_selected = []  # NEW: Track types
-
-        for idx, row in feasible_scores.iterrows():
-            if len(selected_sites) >= n_sites:
-                break
-
-            centroid = row['geometry'].centroid
-
-            if len(selected_geoms) > 0:
-                distances = [centroid.distance(g.centroid) * 69 for g in selected_geoms]
-                if min(distances) < min_distance_mi:
-                    continue
-
+        for _, row in selected.iterrows():
             selected_sites.append(row)
-            selected_geoms.append(row['geometry'])
             charging_types_selected.append(row.get('charging_type', 'unclassified'))  # NEW
             
             # Enhanced output showing charging type
@@ -1102,11 +1207,38 @@ class TruckChargingSiteSelector:
                 print(f"\n  ⚠ Warning: All selected sites are '{list(type_counts.keys())[0]}' type")
                 print(f"     Consider adjusting selection criteria for more diversity")
 
-        result_df = pd.DataFrame(selected_sites)
-        result_gdf = gpd.GeoDataFrame(result_df, geometry='geometry', crs=self.gdf.crs)
+        result_gdf = gpd.GeoDataFrame(selected, geometry='geometry', crs=self.gdf.crs)
 
         return result_gdf
 
+    @staticmethod
+    def _greedy_select_positions(xs, ys, n_sites, min_distance_mi):
+        """
+        Walk candidates (lon/lat centroids) in score order, keeping each one
+        that is at least min_distance_mi from every site kept so far.
+        Distance is planar degrees * 69, as before. Returns kept positions.
+        """
+        positions = []
+        sel_x = np.empty(max(int(n_sites), 0))
+        sel_y = np.empty(max(int(n_sites), 0))
+
+        for i in range(len(xs)):
+            k = len(positions)
+            if k >= n_sites:
+                break
+
+            if k > 0:
+                dx = sel_x[:k] - xs[i]
+                dy = sel_y[:k] - ys[i]
+                if (np.sqrt(dx * dx + dy * dy) * 69).min() < min_distance_mi:
+                    continue
+
+            sel_x[k] = xs[i]
+            sel_y[k] = ys[i]
+            positions.append(i)
+
+        return positions
+
     def _normalize_score(self, series):
         """Normalize series to 0-100 scale."""
         series = pd.to_numeric(series, errors='coerce').fillna(0)
@@ -1155,7 +1287,7 @@ class TruckChargingSiteSelector:
         Classify each tract into a simple two-category "charging type" proxy based on long-distance trip share.
 
         Logic:
-          - long_distance: %_long_distance_trips > 5
+          - long_distance: pct_long_distance_trips > 5
           - other: otherwise
 
         This classification happens AFTER scoring and serves as a descriptor for filtering and summaries.
@@ -1168,7 +1300,7 @@ class TruckChargingSiteSelector:
 
         # Find the long-distance share column (handles a few common naming variants)
         ld_col = None
-        for col in ['%_long_distance_trips', 'pct_long_distance_trips', 'percent_long_distance_trips',
+        for col in ['pct_long_distance_trips', '%_long_distance_trips', 'percent_long_distance_trips',
                     '% long distance trips', '%_long_distance_trip_ends']:
             if col in df.columns:
                 ld_col = col
@@ -1187,7 +1319,9 @@ class TruckChargingSiteSelector:
             charging_type = pd.Series(charging_type, index=df.index)
 
         self.gdf['charging_type'] = charging_type
-        self.gdf['pct_long_distance_trips'] = ld_share
+        if ld_col != 'pct_long_distance_trips':
+            # Keep the loaded values when the canonical column is the source
+            self.gdf['pct_long_distance_trips'] = ld_share
 
         print(f"  Long-distance share threshold: > 5% (or >0.05 if stored as 0–1) → 'long_distance'")
         print(f"   - Long-distance: {(charging_type == 'long_distance').sum():4d} tracts")
@@ -1307,6 +1441,34 @@ class TruckChargingSiteSelector:
         print(f"     Max: {np.max(distances_miles):.1f} miles")
 
     
+    def rows_for_geoids(self, geoids, columns=None):
+        """Rows of self.gdf for the given GEOIDs via a cached GEOID index.
+
+        Unknown GEOIDs are skipped. Avoids scanning the whole GEOID column on
+        every lookup. Returns a new frame (a positional take), so callers may
+        modify it without touching self.gdf.
+        """
+        if self._geoid_index is None:
+            self._geoid_index = pd.Index(self.gdf['GEOID'])
+        positions = self._geoid_index.get_indexer_for(pd.Index(geoids).astype(str).unique())
+        positions = positions[positions >= 0]
+        rows = self.gdf.iloc[positions]
+        return rows if columns is None else rows[columns]
+
+    def columns_for_geoids(self, geoids, columns):
+        """Values of `columns` for each of `geoids`, in the same order.
+
+        One row per input GEOID (NaN for unknown ones) on a 0..n-1 index, so the
+        result lines up with the caller's frame. Uses the same cached GEOID
+        index as rows_for_geoids.
+        """
+        if self._geoid_index is None:
+            self._geoid_index = pd.Index(self.gdf['GEOID'])
+        positions = self._geoid_index.get_indexer(pd.Index(geoids).astype(str))
+        found = positions >= 0
+        values = self.gdf[columns].iloc[positions[found]]
+        return values.set_axis(np.flatnonzero(found)).reindex(np.arange(len(positions)))
+
     def _is_group_disabled(self, weights: dict, keys: list) -> bool:
         """Return True if the user explicitly set *all* keys in this group to 0.
 
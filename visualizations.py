@@ -1,7 +1,7 @@
 import geopandas as gpd
 import plotly.graph_objects as go
 import plotly.express as px
-import json
+import shapely
 import numpy as np
 import pandas as pd
 import logging
@@ -34,6 +34,25 @@ COLOR_SCHEMES = {
 # Utility / shared figure helpers (ported from base repo)
 # ---------------------------------------------------------------------------
 
+# 5 decimal degrees is ~1 m, well below what a tract map can show
+GEOJSON_COORD_DECIMALS = 5
+
+
+def to_display_geojson(geometry: gpd.GeoSeries, decimals: int = GEOJSON_COORD_DECIMALS) -> dict:
+    """GeoJSON FeatureCollection (ids = index) with coordinates rounded for map display"""
+    rounded = shapely.transform(geometry.values, lambda coords: np.round(coords, decimals))
+    # Features are built directly: no per-feature bbox (plotly ignores it) and
+    # no trip through GeoDataFrame.iterfeatures
+    return {
+        'type': 'FeatureCollection',
+        'features': [
+            {'id': fid, 'type': 'Feature', 'properties': {},
+             'geometry': None if geom is None else geom.__geo_interface__}
+            for fid, geom in zip(geometry.index.astype(str), rounded)
+        ],
+    }
+
+
 def create_empty_figure(message: str) -> go.Figure:
     """Create an empty figure with a message"""
     fig = go.Figure()
@@ -1183,7 +1202,7 @@ def create_choropleth_map(gdf, column, title, colorscale='Viridis'):
     # Create choropleth
     fig = px.choropleth_mapbox(
         display_gdf,
-        geojson=display_gdf.geometry.__geo_interface__,
+        geojson=to_display_geojson(display_gdf.geometry),
         locations=display_gdf.index,
         color=column,
         color_continuous_scale=colorscale,
@@ -1254,7 +1273,9 @@ def create_optimal_sites_map(scored_gdf: gpd.GeoDataFrame,
         )
         # ── END VIZ SANITY 2 ─────────────────────────────────────────────────
 
-        geojson_all = json.loads(scored_gdf.to_json())
+        # Geometry-only FeatureCollection (ids = index); skips serializing every
+        # property column to a string and parsing it straight back
+        geojson_all = to_display_geojson(scored_gdf.geometry)
 
         # Default viewport: show Massachusetts
         center_lat = 42.4072
@@ -1278,8 +1299,8 @@ def create_optimal_sites_map(scored_gdf: gpd.GeoDataFrame,
                 if c not in selected_gdf.columns and c in scored_gdf.columns:
                     try:
                         sel_df[c] = scored_gdf.loc[selected_gdf.index, c].values
-                    except Exception:
-                        pass
+                    except KeyError as e:
+                        logger.warning(f"Could not fill '{c}' for selected sites from scored data: {e}")
             sel_df = sel_df.fillna(0)
             sel_customdata = sel_df[cols].values
 
@@ -1522,6 +1543,17 @@ def get_score_color(score: float) -> str:
         return "info"
     else:
         return "success"
+
+
+# Band edges and colors matching get_score_color
+_SCORE_COLOR_BINS = np.array([25, 50, 75])
+_SCORE_COLORS = np.array(["danger", "warning", "info", "success"])
+
+
+def get_score_colors(scores) -> list:
+    """Vectorized get_score_color for a whole column of scores"""
+    idx = np.searchsorted(_SCORE_COLOR_BINS, np.asarray(scores, dtype=float), side='right')
+    return _SCORE_COLORS[idx].tolist()
         
        
         